@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+import argparse
+import datetime as dt
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_PASSWORD = "remote-ui-benchmark"
+DEFAULT_SIZES = "100,10000,100000"
+DEFAULT_ENGINES = "threaded,asyncio"
+SCENARIOS = ("list", "poll", "login", "decide", "wait")
+LIST_PAGE_SIZE = 100
+WAIT_ROUNDS = 10
+WAIT_PARK_SECONDS = 0.5
+CLIENT_TIMEOUT_SECONDS = 60
+PROMPT_TEXT = "Review the generated plan and approve to continue. " * 4
+REPORT_SCHEMA = 1
+IDS_FILE = "bench-ids.json"
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def summarize(latencies, statuses, elapsed):
+    return {
+        "ops": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if status == "error" or int(status) >= 400),
+        "statuses": dict(sorted(statuses.items())),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+        "p50Ms": None if not latencies else round(percentile(latencies, 0.50) * 1000, 2),
+        "p99Ms": None if not latencies else round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def read_rss(pid):
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as handle:
+            for line in handle:
+                name, _, value = line.partition(":")
+                if name in {"VmRSS", "VmHWM"}:
+                    values[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return {"rssKiB": values.get("VmRSS"), "peakRssKiB": values.get("VmHWM")}
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def seed_store(remote_ui_core, size):
+    stamp = int(time.time())
+    requests = []
+    for index in range(size):
+        request = remote_ui_core.new_request(f"Benchmark request {index}", PROMPT_TEXT)
+        request["id"] = f"req_{stamp}_{index:08x}"
+        request["seq"] = index + 1
+        requests.append(request)
+    remote_ui_core.save_requests({"requests": requests, "seq": size})
+    return [request["id"] for request in requests]
+
+
+def cmd_serve(args):
+    sys.path.insert(0, SCRIPT_DIR)
+    import remote_ui_core
+    import remote_ui_server
+
+    _, access_key = remote_ui_core.ensure_config(args.port, password=BENCH_PASSWORD)
+    started = time.perf_counter()
+    ids = seed_store(remote_ui_core, args.size)
+    seed_seconds = time.perf_counter() - started
+    server = remote_ui_server.create_server("127.0.0.1", args.port, args.engine)
+    if not args.rate_limits:
+        server.rate_limiter = remote_ui_server.RateLimiter({name: (10**9, 10**9) for name in remote_ui_core.RATE_LIMITS})
+    remote_ui_server.METRICS.enabled = args.metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with open(os.path.join(remote_ui_core.CONFIG_DIR, IDS_FILE), "w", encoding="utf-8") as handle:
+        json.dump(ids, handle)
+    ready = {"accessKey": access_key, "seedSeconds": round(seed_seconds, 3)}
+    sys.stdout.write(json.dumps(ready) + "\n")
+    sys.stdout.flush()
+    sys.stdin.read()
+    server.shutdown()
+    return 0
+
+
+class ServerProcess:
+    def __init__(self, size, engine, storage=None, rate_limits=False, metrics=False):
+        self.directory = tempfile.mkdtemp(prefix="remote-ui-bench-")
+        self.port = free_port()
+        env = dict(os.environ, CEO_RALPH_REMOTE_UI_DIR=self.directory)
+        env.pop("CEO_RALPH_REMOTE_UI_STORAGE", None)
+        if storage:
+            env["CEO_RALPH_REMOTE_UI_STORAGE"] = storage
+        command = [sys.executable, os.path.abspath(__file__), "serve", "--size", str(size), "--engine", engine]
+        command += ["--port", str(self.port)] + (["--rate-limits"] if rate_limits else [])
+        command += ["--metrics"] if metrics else []
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True)
+        line = self.process.stdout.readline()
+        if not line:
+            self.close()
+            raise RuntimeError(f"Benchmark server exited with status {self.process.wait()}.")
+        ready = json.loads(line)
+        self.access_key = ready["accessKey"]
+        with open(os.path.join(self.directory, IDS_FILE), "r", encoding="utf-8") as handle:
+            self.ids = json.load(handle)
+        self.seed_seconds = ready["seedSeconds"]
+
+    def rss(self):
+        return read_rss(self.process.pid)
+
+    def close(self):
+        if self.process.stdin:
+            self.process.stdin.close()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class DelayProxy:
+    def __init__(self, target_port, delay, port=0):
+        self.target_port = target_port
+        self.delay = delay
+        self.listener = socket.create_server(("127.0.0.1", port), backlog=128)
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            try:
+                upstream = socket.create_connection(("127.0.0.1", self.target_port))
+            except OSError:
+                client.close()
+                continue
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            pending = [2]
+            lock = threading.Lock()
+            for source, sink in ((client, upstream), (upstream, client)):
+                threading.Thread(target=self._pump, args=(source, sink, pending, lock), daemon=True).start()
+
+    def _pump(self, source, sink, pending, lock):
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                if self.delay:
+                    time.sleep(self.delay)
+                sink.sendall(data)
+        except OSError:
+            pass
+        try:
+            sink.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        with lock:
+            pending[0] -= 1
+            done = pending[0] == 0
+        if done:
+            source.close()
+            sink.close()
+
+    def close(self):
+        self.listener.close()
+
+
+class Client:
+    def __init__(self, port, headers=None):
+        self.port = port
+        self.headers = headers or {}
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=CLIENT_TIMEOUT_SECONDS)
+
+    def call(self, method, path, body=None, headers=None):
+        merged = dict(self.headers, **(headers or {}))
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=merged)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return "error", None, time.perf_counter() - started
+        return str(response.status), (response, data), time.perf_counter() - started
+
+    def close(self):
+        self.connection.close()
+
+
+def drive(port, clients, duration, headers, operation):
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        client = Client(port, headers)
+        local_latencies = []
+        local_statuses = {}
+        try:
+            while time.perf_counter() < deadline:
+                outcome = operation(client)
+                if outcome is None:
+                    break
+                status, elapsed = outcome
+                local_latencies.append(elapsed)
+                local_statuses[status] = local_statuses.get(status, 0) + 1
+        finally:
+            client.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+def take_ids(ids):
+    lock = threading.Lock()
+    iterator = iter(ids)
+
+    def take():
+        with lock:
+            return next(iterator, None)
+
+    return take
+
+
+def decision_body(decision="approved"):
+    return json.dumps({"decision": decision, "response": "benchmark"}).encode("utf-8")
+
+
+def run_list(port, bearer, args, ids):
+    def operation(client):
+        status, _, elapsed = client.call("GET", f"/api/requests?limit={LIST_PAGE_SIZE}")
+        return status, elapsed
+
+    return drive(port, args.clients, args.duration, bearer, operation)
+
+
+def run_poll(port, bearer, args, ids):
+    client = Client(port, bearer)
+    _, result, _ = client.call("GET", f"/api/requests?limit={LIST_PAGE_SIZE}")
+    client.close()
+    etag = result[0].getheader("ETag") if result else None
+    headers = dict(bearer, **({"If-None-Match": etag} if etag else {}))
+
+    def operation(client):
+        status, _, elapsed = client.call("GET", f"/api/requests?limit={LIST_PAGE_SIZE}")
+        return status, elapsed
+
+    return drive(port, args.clients, args.duration, headers, operation)
+
+
+def run_login(port, bearer, args, ids):
+    body = f"password={BENCH_PASSWORD}".encode("utf-8")
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+    def operation(client):
+        status, _, elapsed = client.call("POST", "/login", body=body)
+        return status, elapsed
+
+    return drive(port, args.clients, args.duration, headers, operation)
+
+
+def run_decide(port, bearer, args, ids):
+    take = take_ids(ids)
+    headers = dict(bearer, **{"Content-Type": "application/json"})
+
+    def operation(client):
+        request_id = take()
+        if request_id is None:
+            return None
+        status, _, elapsed = client.call("POST", f"/api/requests/{request_id}/decision", body=decision_body())
+        return status, elapsed
+
+    return drive(port, args.clients, args.duration, headers, operation)
+
+
+def run_wait(port, bearer, args, ids):
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    decided_at = {}
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+    decider = Client(port, dict(bearer, **{"Content-Type": "application/json"}))
+    rounds = 0
+    while ids and time.perf_counter() < deadline:
+        batch, ids = ids[: args.clients], ids[args.clients:]
+
+        def waiter(request_id):
+            client = Client(port, bearer)
+            status, _, _ = client.call("GET", f"/api/requests/{request_id}/wait?timeout={CLIENT_TIMEOUT_SECONDS // 2}")
+            returned = time.perf_counter()
+            client.close()
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if request_id in decided_at:
+                    latencies.append(returned - decided_at[request_id])
+
+        threads = [threading.Thread(target=waiter, args=(request_id,)) for request_id in batch]
+        for thread in threads:
+            thread.start()
+        time.sleep(WAIT_PARK_SECONDS)
+        for request_id in batch:
+            with lock:
+                decided_at[request_id] = time.perf_counter()
+            decider.call("POST", f"/api/requests/{request_id}/decision", body=decision_body("denied"))
+        for thread in threads:
+            thread.join()
+        rounds += 1
+    decider.close()
+    result = summarize(latencies, statuses, time.perf_counter() - started)
+    result["rounds"] = rounds
+    return result
+
+
+SCENARIO_RUNNERS = {
+    "list": run_list,
+    "poll": run_poll,
+    "login": run_login,
+    "decide": run_decide,
+    "wait": run_wait,
+}
+
+
+def log(message):
+    sys.stderr.write(message + "\n")
+    sys.stderr.flush()
+
+
+def run_size(size, engine, args):
+    server = ServerProcess(size, engine, args.storage, args.rate_limits, args.metrics)
+    proxy = None
+    try:
+        port = server.port
+        if args.proxy_delay_ms:
+            proxy = DelayProxy(port, args.proxy_delay_ms / 1000)
+            port = proxy.port
+        bearer = {"Authorization": f"Bearer {server.access_key}"}
+        client = Client(port, bearer)
+        _, _, cold = client.call("GET", f"/api/requests?limit={LIST_PAGE_SIZE}")
+        client.close()
+        run = {
+            "size": size,
+            "engine": engine,
+            "seedSeconds": server.seed_seconds,
+            "coldListMs": round(cold * 1000, 2),
+            "idle": server.rss(),
+            "scenarios": {},
+        }
+        wait_count = min(len(server.ids) // 2, args.clients * WAIT_ROUNDS)
+        decide_ids, wait_ids = server.ids[: len(server.ids) - wait_count], server.ids[len(server.ids) - wait_count:]
+        for name in args.scenarios:
+            ids = wait_ids if name == "wait" else decide_ids
+            result = SCENARIO_RUNNERS[name](port, bearer, args, ids)
+            result.update(server.rss())
+            run["scenarios"][name] = result
+            log(f"{engine:>8} size={size:<7} {name:<6} {result['throughput']} ops/s  p50 {result['p50Ms']} ms  p99 {result['p99Ms']} ms  errors {result['errors']}")
+        return run
+    finally:
+        if proxy:
+            proxy.close()
+        server.close()
+
+
+def cmd_run(args):
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+    except ValueError:
+        raise RuntimeError("--sizes must be a comma-separated list of integers.")
+    engines = [engine for engine in args.engines.split(",") if engine]
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = [name for name in args.scenarios if name not in SCENARIO_RUNNERS]
+    if unknown:
+        raise RuntimeError(f"Unknown scenarios: {', '.join(unknown)}. Use any of: {', '.join(SCENARIOS)}.")
+    report = {
+        "schema": REPORT_SCHEMA,
+        "createdAt": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "settings": {
+            "clients": args.clients,
+            "duration": args.duration,
+            "storage": args.storage or "json",
+            "proxyDelayMs": args.proxy_delay_ms,
+            "rateLimits": args.rate_limits,
+            "metrics": args.metrics,
+        },
+        "runs": [run_size(size, engine, args) for size in sizes for engine in engines],
+    }
+    payload = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+    else:
+        sys.stdout.write(payload)
+    return 0
+
+
+def load_report(path):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            report = json.load(handle)
+    except (OSError, ValueError) as exc:
+        raise RuntimeError(f"Cannot read report {path}: {exc}")
+    return {(run["size"], run["engine"], name): result for run in report.get("runs", []) for name, result in run["scenarios"].items()}
+
+
+def change(before, after):
+    if not before or after is None:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def cmd_compare(args):
+    baseline = load_report(args.baseline)
+    current = load_report(args.current)
+    print(f"{'engine':>8} {'size':>7} {'scenario':<8} {'ops/s':>18} {'p99 ms':>20} {'rss KiB':>22}")
+    for key in sorted(baseline.keys() & current.keys(), key=lambda key: (key[1], key[0], SCENARIOS.index(key[2]))):
+        size, engine, name = key
+        old, new = baseline[key], current[key]
+        print(
+            f"{engine:>8} {size:>7} {name:<8}"
+            f" {new['throughput']!s:>9} {change(old['throughput'], new['throughput']):>8}"
+            f" {new['p99Ms']!s:>10} {change(old['p99Ms'], new['p99Ms']):>9}"
+            f" {new['rssKiB']!s:>12} {change(old['rssKiB'], new['rssKiB']):>9}"
+        )
+    return 0
+
+
+def cmd_proxy(args):
+    proxy = DelayProxy(args.target_port, args.delay_ms / 1000, port=args.port)
+    print(f"Forwarding 127.0.0.1:{proxy.port} -> 127.0.0.1:{args.target_port} with {args.delay_ms} ms delay each way. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        proxy.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="CEO Ralph Remote UI benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Seed stores, drive load and print a JSON report")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    run_parser.add_argument("--engines", default=DEFAULT_ENGINES)
+    run_parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    run_parser.add_argument("--clients", type=int, default=8)
+    run_parser.add_argument("--duration", type=float, default=5.0)
+    run_parser.add_argument("--storage", choices=("json", "sqlite"))
+    run_parser.add_argument("--proxy-delay-ms", type=float, default=0)
+    run_parser.add_argument("--rate-limits", action="store_true")
+    run_parser.add_argument("--metrics", action="store_true")
+    run_parser.add_argument("--output")
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.set_defaults(func=cmd_compare)
+
+    proxy_parser = subparsers.add_parser("proxy", help="Run the delay-injecting proxy on its own")
+    proxy_parser.add_argument("--target-port", type=int, default=8123)
+    proxy_parser.add_argument("--port", type=int, default=9123)
+    proxy_parser.add_argument("--delay-ms", type=float, default=50)
+    proxy_parser.set_defaults(func=cmd_proxy)
+
+    serve_parser = subparsers.add_parser("serve", help="Host one seeded server for `run` (internal)")
+    serve_parser.add_argument("--size", type=int, required=True)
+    serve_parser.add_argument("--engine", default="threaded")
+    serve_parser.add_argument("--port", type=int, required=True)
+    serve_parser.add_argument("--rate-limits", action="store_true")
+    serve_parser.add_argument("--metrics", action="store_true")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        result = args.func(args)
+    except RuntimeError as exc:
+        print(str(exc))
+        return 1
+    return 0 if result is None else result
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1224 @@
+import base64
+import bisect
+import datetime as dt
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+import types
+
+
+CONFIG_DIR = os.environ.get(
+    "CEO_RALPH_REMOTE_UI_DIR",
+    os.path.join(os.path.expanduser("~"), ".ceo-ralph", "remote-ui"),
+)
+STORAGE_BACKEND = os.environ.get("CEO_RALPH_REMOTE_UI_STORAGE")
+CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+REQUESTS_PATH = os.path.join(CONFIG_DIR, "requests.json")
+REQUESTS_JOURNAL_PATH = os.path.join(CONFIG_DIR, "requests.journal")
+REQUESTS_SEQ_PATH = os.path.join(CONFIG_DIR, "requests.seq")
+REQUESTS_LOCK_PATH = os.path.join(CONFIG_DIR, "requests.lock")
+REQUESTS_DB_PATH = os.path.join(CONFIG_DIR, "requests.db")
+BLOBS_DIR = os.path.join(CONFIG_DIR, "blobs")
+NAMESPACES_DIR = os.path.join(CONFIG_DIR, "namespaces")
+DEFAULT_NAMESPACE = "default"
+NAMESPACE = os.environ.get("CEO_RALPH_REMOTE_UI_NAMESPACE") or DEFAULT_NAMESPACE
+NAMESPACE_PATTERN = re.compile(r"[a-z0-9][a-z0-9._-]{0,63}")
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+LOAD_RETRIES = 3
+SERVER_STATE_PATH = os.path.join(CONFIG_DIR, "server.json")
+SESSIONS_PATH = os.path.join(CONFIG_DIR, "sessions.json")
+SESSIONS_LOCK_PATH = os.path.join(CONFIG_DIR, "sessions.lock")
+SESSION_COOKIE = "ceo_ralph_session"
+SESSION_TTL_SECONDS = 60 * 60 * 12
+SESSION_SLIDE_STEP_SECONDS = 300
+KEY_ITERATIONS = 200_000
+PASSWORD_ITERATIONS = 200_000
+KEY_CACHE_TTL_SECONDS = 300
+KEY_CACHE_MAX_ENTRIES = 64
+HASH_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+HASH_QUEUE_LIMIT = 16
+HASH_RETRY_AFTER_SECONDS = 2
+RATE_LIMITS = {
+    "login": (5, 5 / 60),
+    "decision": (30, 1.0),
+    "read": (120, 20.0),
+}
+RATE_LIMIT_MAX_CLIENTS = 4096
+TRUSTED_PROXY_ADDRESSES = {"127.0.0.1", "::1"}
+WAIT_POLL_MAX_SECONDS = 60
+FILE_POLL_INTERVAL_SECONDS = 0.5
+MONITOR_RETRY_SECONDS = 1
+EVENT_BUFFER_SIZE = 256
+CHANGE_LOG_SLACK = 1024
+SNAPSHOT_CHUNK_SIZE = 256
+SSE_HEARTBEAT_SECONDS = 15
+KEEPALIVE_TIMEOUT_SECONDS = 30
+SERVER_ENGINE_NAMES = ("asyncio", "threaded")
+REQUEST_STATUSES = ("pending", "approved", "denied", "expired")
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 500
+BLOB_THRESHOLD_BYTES = 4096
+BODY_PREVIEW_CHARS = 280
+MAX_BODY_BYTES = 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+GZIP_ETAG_SUFFIX = "-gz"
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_BLOB_SIZE_TTL_SECONDS = 60
+STATS_BUCKET_SECONDS = 3600
+STATS_BINS_PER_DOUBLING = 8
+STATS_MIN_LATENCY_SECONDS = 0.001
+STATS_ZERO_BIN = math.floor(math.log2(STATS_MIN_LATENCY_SECONDS) * STATS_BINS_PER_DOUBLING) - 1
+STATS_DEFAULT_WINDOW = "7d"
+STATS_WINDOW_UNITS = {"h": 3600, "d": 86400}
+PENDING_AGE_BUCKETS = (
+    ("<1m", 60),
+    ("1m-5m", 300),
+    ("5m-15m", 900),
+    ("15m-1h", 3600),
+    ("1h-4h", 4 * 3600),
+    ("4h-24h", 86400),
+    (">24h", None),
+)
+
+
+def format_timestamp(moment):
+    return moment.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def utc_now():
+    return format_timestamp(dt.datetime.now(dt.timezone.utc))
+
+
+def utc_after(seconds):
+    return format_timestamp(dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=seconds))
+
+
+def parse_timestamp(value):
+    try:
+        return dt.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def b64encode(raw_bytes):
+    return base64.urlsafe_b64encode(raw_bytes).decode("ascii").rstrip("=")
+
+
+def b64decode(raw_str):
+    padding = "=" * ((4 - len(raw_str) % 4) % 4)
+    return base64.urlsafe_b64decode(raw_str + padding)
+
+
+def ensure_dir(path):
+    os.makedirs(path, exist_ok=True)
+
+
+def load_json(path, default):
+    try:
+        if "../" in path or "..\\" in path:
+            raise Exception("Invalid file path")
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return default
+
+
+def fsync_dir(path):
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data, mode=None, durable=False):
+    ensure_dir(os.path.dirname(path))
+    tmp_path = f"{path}.tmp"
+    if "../" in tmp_path or "..\\" in tmp_path:
+        raise Exception("Invalid file path")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+        if durable:
+            handle.flush()
+            os.fsync(handle.fileno())
+    if mode is not None:
+        os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+    if durable:
+        fsync_dir(os.path.dirname(path))
+
+
+def hash_access_key(access_key, salt_bytes):
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", access_key.encode("utf-8"), salt_bytes, KEY_ITERATIONS
+    )
+    return b64encode(digest)
+
+
+def hash_password(password, salt_bytes):
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt_bytes, PASSWORD_ITERATIONS
+    )
+    return b64encode(digest)
+
+
+def generate_access_key():
+    return secrets.token_urlsafe(32)
+
+
+def prompt_password():
+    if not sys.stdin.isatty():
+        raise RuntimeError("Interactive password prompt requires a TTY.")
+    import getpass
+
+    while True:
+        password = getpass.getpass("Set Remote UI password: ")
+        confirm = getpass.getpass("Confirm password: ")
+        if password != confirm:
+            print("Passwords do not match. Try again.")
+            continue
+        if len(password) < 12:
+            print("Password must be at least 12 characters.")
+            continue
+        return password
+
+
+def read_password_stdin():
+    raw = sys.stdin.read()
+    password = raw.strip()
+    if not password:
+        raise RuntimeError("Password is required.")
+    if len(password) < 12:
+        raise RuntimeError("Password must be at least 12 characters.")
+    return password
+
+
+def decode_salt(value):
+    try:
+        return b64decode(value)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class ConfigSnapshot:
+    __slots__ = ("values", "access_key_salt", "password_salt")
+
+    def __init__(self, values):
+        self.values = types.MappingProxyType(dict(values))
+        self.access_key_salt = decode_salt(values.get("accessKeySalt"))
+        self.password_salt = decode_salt(values.get("passwordSalt"))
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class ConfigStore:
+    def __init__(self, path=CONFIG_PATH):
+        self.path = path
+        self._state = (object(), None)
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def subscribe(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def current(self):
+        signature = file_signature(self.path)
+        seen, snapshot = self._state
+        if seen == signature:
+            return snapshot
+        with self._lock:
+            seen, previous = self._state
+            if seen == signature:
+                return previous
+            try:
+                values = load_json(self.path, None)
+            except ValueError:
+                values = None
+            snapshot = ConfigSnapshot(values) if isinstance(values, dict) and values else previous
+            self._state = (signature, snapshot)
+        if snapshot is not previous:
+            self._notify(previous, snapshot)
+        return snapshot
+
+    def cached(self):
+        return self._state[1]
+
+    def write(self, values):
+        with self._lock:
+            atomic_write_json(self.path, values)
+            previous = self._state[1]
+            snapshot = ConfigSnapshot(values)
+            self._state = (file_signature(self.path), snapshot)
+        self._notify(previous, snapshot)
+        return snapshot
+
+    def _notify(self, previous, snapshot):
+        for listener in list(self._listeners):
+            listener(previous, snapshot)
+
+
+CONFIG = ConfigStore()
+
+
+def ensure_config(port, password=None):
+    config = CONFIG.current()
+    if config:
+        return config, None
+    access_key = generate_access_key()
+    salt = secrets.token_bytes(16)
+    password_salt = secrets.token_bytes(16)
+    if password is None:
+        raise RuntimeError("Remote UI setup requires a password.")
+    config = {
+        "port": port,
+        "accessKeySalt": b64encode(salt),
+        "accessKeyHash": hash_access_key(access_key, salt),
+        "passwordSalt": b64encode(password_salt),
+        "passwordHash": hash_password(password, password_salt),
+        "publicUrl": None,
+        "instanceId": secrets.token_hex(6),
+        "createdAt": utc_now(),
+        "updatedAt": utc_now(),
+    }
+    return CONFIG.write(config), access_key
+
+
+def update_config(updates):
+    config = CONFIG.current()
+    if not config:
+        raise RuntimeError("Remote UI is not set up. Run `setup` first.")
+    values = dict(config.values)
+    values.update(updates)
+    values["updatedAt"] = utc_now()
+    return CONFIG.write(values)
+
+
+def parse_journal_lines(lines):
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return entries
+
+
+def read_journal(path=REQUESTS_JOURNAL_PATH):
+    try:
+        with open(path, "rb") as handle:
+            return parse_journal_lines(handle)
+    except FileNotFoundError:
+        return []
+
+
+def journal_requests(entries):
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get("op") != "put":
+            continue
+        request = entry.get("request")
+        if isinstance(request, dict):
+            yield request
+
+
+def apply_journal(payload, entries):
+    requests = payload["requests"]
+    positions = {request.get("id"): index for index, request in enumerate(requests)}
+    for request in journal_requests(entries):
+        index = positions.get(request.get("id"))
+        if index is None:
+            positions[request.get("id")] = len(requests)
+            requests.append(request)
+        else:
+            requests[index] = request
+    return payload
+
+
+class StoreLock:
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._fd = self._acquire()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                self._release(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def _acquire(self):
+        ensure_dir(os.path.dirname(self.path))
+        fd = os.open(self.path, os.O_CREAT | (os.O_RDWR if os.name == "nt" else os.O_RDONLY), 0o600)
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                import fcntl
+
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def _release(self, fd):
+        if os.name == "nt":
+            import msvcrt
+
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+STORE_LOCKS = {}
+STORE_LOCKS_GUARD = threading.Lock()
+
+
+def store_lock(path):
+    with STORE_LOCKS_GUARD:
+        if path not in STORE_LOCKS:
+            STORE_LOCKS[path] = StoreLock(path)
+        return STORE_LOCKS[path]
+
+
+def normalize_namespace(value):
+    name = (value or DEFAULT_NAMESPACE).strip().lower()
+    if not NAMESPACE_PATTERN.fullmatch(name):
+        raise ValueError("namespace must be 1-64 letters, digits, '.', '_' or '-', starting with a letter or digit")
+    return name
+
+
+def namespace_dir(namespace=None):
+    name = normalize_namespace(namespace)
+    return CONFIG_DIR if name == DEFAULT_NAMESPACE else os.path.join(NAMESPACES_DIR, name)
+
+
+def namespace_exists(namespace):
+    return os.path.isdir(namespace_dir(namespace))
+
+
+def list_namespaces():
+    try:
+        names = os.listdir(NAMESPACES_DIR)
+    except FileNotFoundError:
+        names = []
+    found = {name for name in names if NAMESPACE_PATTERN.fullmatch(name) and os.path.isdir(os.path.join(NAMESPACES_DIR, name))}
+    return [DEFAULT_NAMESPACE] + sorted(found - {DEFAULT_NAMESPACE})
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_status ON requests (status, created_at, id);
+CREATE INDEX IF NOT EXISTS requests_created_at ON requests (created_at, id);
+CREATE INDEX IF NOT EXISTS requests_seq ON requests (seq);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+def apply_transition(request, updates, expected_version):
+    if request is None:
+        return "not_found", None
+    version = request.get("version") or 1
+    if expected_version is not None and version != expected_version:
+        return "version_mismatch", request
+    if request.get("status") != "pending":
+        return "conflict", request
+    request = dict(request, **updates)
+    request["version"] = version + 1
+    return "ok", request
+
+
+def apply_transitions(changes, find):
+    applied = {}
+    results = []
+    for request_id, updates, expected_version in changes:
+        request = applied[request_id] if request_id in applied else find(request_id)
+        outcome, request = apply_transition(request, updates, expected_version)
+        if outcome == "ok":
+            applied[request_id] = request
+        results.append((outcome, request))
+    if all(outcome == "ok" for outcome, _ in results):
+        for request in applied.values():
+            externalize_body(request, "response")
+    return results
+
+
+class JsonRequestStorage:
+    name = "json"
+
+    def __init__(self, directory=CONFIG_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, os.path.basename(REQUESTS_PATH))
+        self.journal_path = os.path.join(directory, os.path.basename(REQUESTS_JOURNAL_PATH))
+        self.seq_path = os.path.join(directory, os.path.basename(REQUESTS_SEQ_PATH))
+        self.lock = store_lock(os.path.join(directory, os.path.basename(REQUESTS_LOCK_PATH)))
+        self.watch_paths = [self.path, self.journal_path]
+
+    def ensure(self):
+        if not os.path.exists(self.path):
+            atomic_write_json(self.path, {"requests": []})
+
+    def exists(self):
+        return os.path.exists(self.path) or os.path.exists(self.journal_path)
+
+    def load(self):
+        for _ in range(LOAD_RETRIES):
+            signature = file_signature(self.path)
+            payload = self._read_payload()
+            if file_signature(self.path) == signature:
+                return payload
+        with self.lock:
+            return self._read_payload()
+
+    def _read_payload(self):
+        payload = load_json(self.path, {"requests": []})
+        if not isinstance(payload, dict) or not isinstance(payload.get("requests"), list):
+            payload = {"requests": []}
+        entries = read_journal(self.journal_path)
+        if entries:
+            apply_journal(payload, entries)
+        seq = payload.get("seq") if isinstance(payload.get("seq"), int) else 0
+        for request in payload["requests"]:
+            if isinstance(request.get("seq"), int) and request["seq"] > seq:
+                seq = request["seq"]
+        payload["seq"] = seq
+        return payload
+
+    def find(self, request_id):
+        return find_request(self.load(), request_id)
+
+    def save(self, payload):
+        with self.lock:
+            atomic_write_json(self.path, payload, durable=True)
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+
+    def compact(self):
+        with self.lock:
+            self.save(self.load())
+
+    def close(self):
+        pass
+
+    def signature(self):
+        return (file_signature(self.path), file_signature(self.journal_path))
+
+    def read_since(self, cursor):
+        snapshot_signature = file_signature(self.path)
+        requests = []
+        if cursor is None or cursor[0] != snapshot_signature:
+            payload = load_json(self.path, {"requests": []})
+            snapshot = payload.get("requests") if isinstance(payload, dict) else None
+            requests.extend(request for request in snapshot or [] if isinstance(request, dict))
+            journal_inode, offset = None, 0
+        else:
+            _, journal_inode, offset = cursor
+        try:
+            with open(self.journal_path, "rb") as handle:
+                stat = os.fstat(handle.fileno())
+                if journal_inode is not None and (stat.st_ino != journal_inode or stat.st_size < offset):
+                    return self.read_since(None)
+                handle.seek(offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return requests, (snapshot_signature, None, 0)
+        end = data.rfind(b"\n") + 1
+        requests.extend(journal_requests(parse_journal_lines(data[:end].split(b"\n"))))
+        return requests, (snapshot_signature, stat.st_ino, offset + end)
+
+    def commit(self, requests):
+        with self.lock:
+            seq = self._read_sequence()
+            for request in requests:
+                seq += 1
+                request["seq"] = seq
+            self._write_sequence(seq)
+            self._append_journal({"op": "put", "request": request} for request in requests)
+
+    def transition(self, request_id, updates, expected_version=None, current=None):
+        return self.transition_many([(request_id, updates, expected_version)], current)[0]
+
+    def transition_many(self, changes, current=None):
+        with self.lock:
+            results = apply_transitions(changes, current or functools.partial(find_request, self.load()))
+            if all(outcome == "ok" for outcome, _ in results):
+                self.commit([request for _, request in results])
+            return results
+
+    def _read_sequence(self):
+        try:
+            with open(self.seq_path, "r", encoding="utf-8") as handle:
+                return int(handle.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return self.load()["seq"]
+
+    def _write_sequence(self, seq):
+        fd = os.open(self.seq_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, f"{seq:020d}\n".encode("ascii"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _append_journal(self, entries):
+        ensure_dir(self.directory)
+        data = b"".join(
+            json.dumps(entry, separators=(",", ":"), sort_keys=True).encode("utf-8") + b"\n" for entry in entries
+        )
+        with self.lock:
+            with open(self.journal_path, "a+b") as handle:
+                size = handle.seek(0, os.SEEK_END)
+                if size:
+                    handle.seek(size - 1)
+                    if handle.read(1) != b"\n":
+                        data = b"\n" + data
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+                created = not size
+                size = handle.tell()
+            if created:
+                fsync_dir(self.directory)
+            if size >= JOURNAL_COMPACT_BYTES:
+                self.compact()
+
+
+class SQLiteRequestStorage:
+    name = "sqlite"
+
+    def __init__(self, directory=CONFIG_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, os.path.basename(REQUESTS_DB_PATH))
+        self.watch_paths = [self.path, f"{self.path}-wal"]
+        self._lock = threading.RLock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            import sqlite3
+
+            ensure_dir(os.path.dirname(self.path))
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.executescript(SQLITE_SCHEMA)
+            self._connection = connection
+            self._write(self._migrate)
+        return self._connection
+
+    def _write(self, operation):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = operation(connection)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return result
+
+    def _read(self, sql, parameters=()):
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def _migrate(self, connection):
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'migratedAt'").fetchone():
+            return
+        source = JsonRequestStorage(self.directory)
+        if source.exists():
+            with source.lock:
+                payload = source.load()
+            seq = payload["seq"]
+            requests = []
+            for request in payload["requests"]:
+                if not isinstance(request.get("id"), str):
+                    continue
+                if not isinstance(request.get("seq"), int):
+                    seq += 1
+                    request = dict(request, seq=seq)
+                requests.append(request)
+            connection.executemany(
+                "INSERT OR REPLACE INTO requests (id, seq, status, created_at, data) VALUES (?, ?, ?, ?, ?)",
+                [self._row(request) for request in requests],
+            )
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seq', ?)", (seq,))
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migratedAt', ?)", (utc_now(),))
+
+    def _row(self, request):
+        return (
+            request["id"],
+            request["seq"],
+            request.get("status") or "pending",
+            request.get("createdAt") or "",
+            json.dumps(request, separators=(",", ":"), sort_keys=True),
+        )
+
+    def _sequence(self, connection):
+        row = connection.execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _insert(self, connection, requests):
+        seq = self._sequence(connection)
+        for request in requests:
+            seq += 1
+            request["seq"] = seq
+        connection.executemany(
+            "INSERT OR REPLACE INTO requests (id, seq, status, created_at, data) VALUES (?, ?, ?, ?, ?)",
+            [self._row(request) for request in requests],
+        )
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seq', ?)", (seq,))
+
+    def ensure(self):
+        with self._lock:
+            self._connect()
+
+    def load(self):
+        rows = self._read("SELECT data FROM requests ORDER BY created_at, id")
+        return {"requests": [json.loads(row[0]) for row in rows], "seq": self.signature()}
+
+    def find(self, request_id):
+        rows = self._read("SELECT data FROM requests WHERE id = ?", (request_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def save(self, payload):
+        def replace(connection):
+            requests = [request for request in payload.get("requests", []) if isinstance(request.get("id"), str)]
+            seq = max([payload.get("seq") or 0] + [request.get("seq") or 0 for request in requests])
+            connection.execute("DELETE FROM requests")
+            connection.executemany(
+                "INSERT INTO requests (id, seq, status, created_at, data) VALUES (?, ?, ?, ?, ?)",
+                [self._row(dict(request, seq=request.get("seq") or 0)) for request in requests],
+            )
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seq', ?)", (seq,))
+
+        self._write(replace)
+
+    def compact(self):
+        with self._lock:
+            self._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            connection, self._connection = self._connection, None
+            if connection is not None:
+                connection.close()
+
+    def signature(self):
+        rows = self._read("SELECT value FROM meta WHERE key = 'seq'")
+        return int(rows[0][0]) if rows else 0
+
+    def read_since(self, cursor):
+        since = cursor or 0
+        rows = self._read("SELECT seq, data FROM requests WHERE seq > ? ORDER BY seq", (since,))
+        if rows:
+            since = rows[-1][0]
+        return [json.loads(row[1]) for row in rows], since
+
+    def commit(self, requests):
+        self._write(lambda connection: self._insert(connection, requests))
+
+    def transition(self, request_id, updates, expected_version=None, current=None):
+        return self.transition_many([(request_id, updates, expected_version)])[0]
+
+    def transition_many(self, changes, current=None):
+        def apply(connection):
+            def find(request_id):
+                row = connection.execute("SELECT data FROM requests WHERE id = ?", (request_id,)).fetchone()
+                return json.loads(row[0]) if row else None
+
+            results = apply_transitions(changes, find)
+            if all(outcome == "ok" for outcome, _ in results):
+                self._insert(connection, [request for _, request in results])
+            return results
+
+        return self._write(apply)
+
+
+STORAGE_BACKENDS = {
+    JsonRequestStorage.name: JsonRequestStorage,
+    SQLiteRequestStorage.name: SQLiteRequestStorage,
+}
+_STORAGES = {}
+_STORAGES_LOCK = threading.Lock()
+_INHERITED_STORAGES = []
+
+
+def storage_backend_name():
+    if STORAGE_BACKEND:
+        return STORAGE_BACKEND
+    config = CONFIG.current()
+    return (config and config.get("storage")) or JsonRequestStorage.name
+
+
+def get_storage(namespace=None):
+    directory = namespace_dir(namespace)
+    storage = _STORAGES.get(directory)
+    if storage is None:
+        name = storage_backend_name()
+        if name not in STORAGE_BACKENDS:
+            raise RuntimeError(f"Unknown storage backend: {name}. Use one of: {', '.join(STORAGE_BACKENDS)}.")
+        with _STORAGES_LOCK:
+            storage = _STORAGES.get(directory)
+            if storage is None:
+                storage = STORAGE_BACKENDS[name](directory)
+                storage.committer = GroupCommitter(storage.commit)
+                _STORAGES[directory] = storage
+    return storage
+
+
+def close_storages():
+    with _STORAGES_LOCK:
+        storages = list(_STORAGES.values())
+        _STORAGES.clear()
+    for storage in storages:
+        storage.close()
+
+
+def forget_inherited_storages():
+    _INHERITED_STORAGES.extend(_STORAGES.values())
+    _STORAGES.clear()
+
+
+def load_requests(namespace=None):
+    return get_storage(namespace).load()
+
+
+def save_requests(payload, namespace=None):
+    get_storage(namespace).save(payload)
+
+
+class GroupCommitter:
+    def __init__(self, commit):
+        self._commit = commit
+        self._condition = threading.Condition()
+        self._pending = []
+        self._leader = False
+
+    def submit(self, requests):
+        ticket = {"done": False, "error": None}
+        with self._condition:
+            self._pending.append((requests, ticket))
+            while self._leader and not ticket["done"]:
+                self._condition.wait()
+            if ticket["done"]:
+                if ticket["error"]:
+                    raise ticket["error"]
+                return
+            self._leader = True
+            batch, self._pending = self._pending, []
+        error = None
+        try:
+            self._commit([request for requests, _ in batch for request in requests])
+        except Exception as exc:
+            error = exc
+        with self._condition:
+            for _, waiting in batch:
+                waiting["done"] = True
+                waiting["error"] = error
+            self._leader = False
+            self._condition.notify_all()
+        if error:
+            raise error
+
+
+def put_request(request, namespace=None):
+    get_storage(namespace).committer.submit([request])
+
+
+def ensure_requests(namespace=None):
+    get_storage(namespace).ensure()
+
+
+def blob_path(digest):
+    return os.path.join(BLOBS_DIR, digest[:2], digest[2:])
+
+
+def store_blob(text):
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest)
+    try:
+        stored = os.path.getsize(path)
+    except FileNotFoundError:
+        stored = None
+    if stored != len(data):
+        ensure_dir(os.path.dirname(path))
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+        fsync_dir(os.path.dirname(path))
+    return digest
+
+
+def read_blob(digest, size=None):
+    if not isinstance(digest, str) or not re.fullmatch(r"[0-9a-f]{64}", digest):
+        return None
+    try:
+        with open(blob_path(digest), "rb") as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        return None
+    if size is not None and len(data) != size:
+        return None
+    return data.decode("utf-8")
+
+
+def externalize_body(request, key):
+    text = request.get(key) or ""
+    size = len(text.encode("utf-8"))
+    if size <= BLOB_THRESHOLD_BYTES:
+        return request
+    request[f"{key}Digest"] = store_blob(text)
+    request[f"{key}Size"] = size
+    request[key] = text[:BODY_PREVIEW_CHARS].rstrip() + "\u2026"
+    return request
+
+
+def full_body(request, key):
+    digest = request.get(f"{key}Digest")
+    text = read_blob(digest, request.get(f"{key}Size")) if digest else None
+    return request.get(key) if text is None else text
+
+
+def inline_bodies(request):
+    return dict(request, **{key: full_body(request, key) for key in ("prompt", "response")})
+
+
+def new_request(title, prompt, expires_in=None):
+    request_id = f"req_{int(time.time())}_{secrets.token_hex(4)}"
+    request = {
+        "id": request_id,
+        "title": title,
+        "prompt": prompt,
+        "status": "pending",
+        "response": "",
+        "createdAt": utc_now(),
+        "decidedAt": None,
+        "version": 1,
+    }
+    if expires_in:
+        request["expiresAt"] = utc_after(expires_in)
+    return externalize_body(request, "prompt")
+
+
+def create_request(title, prompt, expires_in=None, namespace=None):
+    request = new_request(title, prompt, expires_in)
+    put_request(request, namespace)
+    return request
+
+
+def create_requests(specs, namespace=None):
+    requests = [new_request(spec["title"], spec["prompt"], spec.get("expiresIn")) for spec in specs]
+    get_storage(namespace).committer.submit(requests)
+    return requests
+
+
+def parse_request_specs(items):
+    if not isinstance(items, list) or not items:
+        raise ValueError("requests must be a non-empty list")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"at most {MAX_BATCH_SIZE} requests per batch")
+    specs = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("title"), str) or not isinstance(item.get("prompt"), str):
+            raise ValueError(f"request {index}: title and prompt must be strings")
+        expires_in = item.get("expiresIn")
+        if expires_in is not None and (not isinstance(expires_in, int) or isinstance(expires_in, bool) or expires_in <= 0):
+            raise ValueError(f"request {index}: expiresIn must be a positive integer")
+        specs.append({"title": item["title"], "prompt": item["prompt"], "expiresIn": expires_in})
+    return specs
+
+
+def is_expired(request, now=None):
+    if request.get("status") != "pending":
+        return False
+    expires_at = parse_timestamp(request.get("expiresAt"))
+    return expires_at is not None and expires_at <= (time.time() if now is None else now)
+
+
+def transition_request(request_id, updates, expected_version=None, current=None, namespace=None):
+    return get_storage(namespace).transition(request_id, updates, expected_version, current)
+
+
+def transition_requests(changes, current=None, namespace=None):
+    return get_storage(namespace).transition_many(changes, current)
+
+
+def expire_request(request_id, current=None, namespace=None):
+    return transition_request(
+        request_id, {"status": "expired", "decidedAt": utc_now()}, current=current, namespace=namespace
+    )
+
+
+def parse_window(value):
+    if value == "all":
+        return None
+    unit = STATS_WINDOW_UNITS.get(value[-1:])
+    if unit is None or not value[:-1].isdigit() or int(value[:-1]) < 1:
+        raise ValueError("window must look like 24h, 7d or all")
+    return int(value[:-1]) * unit
+
+
+def latency_bin(latency):
+    if latency < STATS_MIN_LATENCY_SECONDS:
+        return STATS_ZERO_BIN
+    return math.floor(math.log2(latency) * STATS_BINS_PER_DOUBLING)
+
+
+class StatsBucket:
+    __slots__ = ("outcomes", "count", "total", "low", "high", "bins")
+
+    def __init__(self):
+        self.outcomes = {}
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = 0.0
+        self.bins = {}
+
+
+class ApprovalStats:
+    def __init__(self):
+        self.buckets = {}
+        self.starts = []
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def record(self, request_id, status, created_at, decided_at, previous_status=None):
+        with self.lock:
+            if status == "pending":
+                created = parse_timestamp(created_at)
+                self.pending[request_id] = time.time() if created is None else created
+                return
+            self.pending.pop(request_id, None)
+            decided = parse_timestamp(decided_at)
+            if previous_status not in {None, "pending"} or decided is None:
+                return
+            start = int(decided // STATS_BUCKET_SECONDS * STATS_BUCKET_SECONDS)
+            bucket = self.buckets.get(start)
+            if bucket is None:
+                bucket = self.buckets[start] = StatsBucket()
+                bisect.insort(self.starts, start)
+            bucket.outcomes[status] = bucket.outcomes.get(status, 0) + 1
+            created = parse_timestamp(created_at)
+            if status == "expired" or created is None:
+                return
+            latency = max(0.0, decided - created)
+            index = latency_bin(latency)
+            bucket.bins[index] = bucket.bins.get(index, 0) + 1
+            bucket.count += 1
+            bucket.total += latency
+            bucket.low = min(bucket.low, latency)
+            bucket.high = max(bucket.high, latency)
+
+    def summary(self, window=None, now=None):
+        now = time.time() if now is None else now
+        since = None if window is None else int((now - window) // STATS_BUCKET_SECONDS * STATS_BUCKET_SECONDS)
+        outcomes = {status: 0 for status in REQUEST_STATUSES if status != "pending"}
+        bins = {}
+        count, total, low, high = 0, 0.0, math.inf, 0.0
+        with self.lock:
+            first = 0 if since is None else bisect.bisect_left(self.starts, since)
+            for start in self.starts[first:]:
+                bucket = self.buckets[start]
+                for status, value in bucket.outcomes.items():
+                    outcomes[status] = outcomes.get(status, 0) + value
+                for index, value in bucket.bins.items():
+                    bins[index] = bins.get(index, 0) + value
+                count += bucket.count
+                total += bucket.total
+                low = min(low, bucket.low)
+                high = max(high, bucket.high)
+            ages = [max(0.0, now - created) for created in self.pending.values()]
+
+        def percentile(fraction):
+            if not count:
+                return None
+            rank = max(1, math.ceil(fraction * count))
+            seen = 0
+            for index in sorted(bins):
+                seen += bins[index]
+                if seen >= rank:
+                    value = 0.0 if index == STATS_ZERO_BIN else 2 ** ((index + 0.5) / STATS_BINS_PER_DOUBLING)
+                    return round(min(max(value, low), high), 1)
+
+        decided = sum(outcomes.values())
+        age_buckets = {label: 0 for label, _ in PENDING_AGE_BUCKETS}
+        for age in ages:
+            for label, limit in PENDING_AGE_BUCKETS:
+                if limit is None or age < limit:
+                    age_buckets[label] += 1
+                    break
+        return {
+            "window": {
+                "since": None if since is None else format_timestamp(dt.datetime.fromtimestamp(since, dt.timezone.utc)),
+                "until": format_timestamp(dt.datetime.fromtimestamp(now, dt.timezone.utc)),
+            },
+            "decided": decided,
+            "outcomes": outcomes,
+            "ratios": {status: round(value / decided, 4) if decided else None for status, value in outcomes.items()},
+            "timeToDecision": {
+                "count": count,
+                "meanSeconds": round(total / count, 1) if count else None,
+                "p50Seconds": percentile(0.5),
+                "p90Seconds": percentile(0.9),
+                "p99Seconds": percentile(0.99),
+                "maxSeconds": round(high, 1) if count else None,
+            },
+            "pending": {
+                "count": len(ages),
+                "oldestSeconds": round(max(ages), 1) if ages else None,
+                "ages": age_buckets,
+            },
+        }
+
+
+def find_request(payload, request_id):
+    for request in payload.get("requests", []):
+        if request.get("id") == request_id:
+            return request
+    return None
+
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+
+class FileWatcher:
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._fd = None
+        if sys.platform.startswith("linux"):
+            self._fd = self._open_inotify({os.path.dirname(path) for path in self.paths})
+        self._signature = self._stat_signature()
+
+    def _open_inotify(self, directories):
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for directory in directories:
+            ensure_dir(directory)
+            if libc.inotify_add_watch(fd, directory.encode("utf-8"), mask) < 0:
+                os.close(fd)
+                return None
+        return fd
+
+    def _stat_signature(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def wait(self, timeout=None):
+        if self._fd is not None:
+            import select
+
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if not ready:
+                return False
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature = self._stat_signature()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            delay = FILE_POLL_INTERVAL_SECONDS
+            if deadline is not None:
+                delay = max(0.0, min(delay, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,2442 @@
+import asyncio
+import bisect
+import contextlib
+import gzip
+import hashlib
+import heapq
+import hmac
+import io
+import itertools
+import json
+import operator
+import os
+import secrets
+import signal
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from remote_ui_core import (
+    BLOBS_DIR,
+    CHANGE_LOG_SLACK,
+    CONFIG,
+    DEFAULT_NAMESPACE,
+    EVENT_BUFFER_SIZE,
+    GZIP_ETAG_SUFFIX,
+    GZIP_LEVEL,
+    GZIP_MIN_BYTES,
+    HASH_QUEUE_LIMIT,
+    HASH_RETRY_AFTER_SECONDS,
+    HASH_WORKERS,
+    IMMUTABLE_CACHE_CONTROL,
+    KEEPALIVE_TIMEOUT_SECONDS,
+    KEY_CACHE_MAX_ENTRIES,
+    KEY_CACHE_TTL_SECONDS,
+    MAX_BATCH_SIZE,
+    MAX_BODY_BYTES,
+    MAX_PAGE_SIZE,
+    METRICS_BLOB_SIZE_TTL_SECONDS,
+    METRICS_LATENCY_BUCKETS,
+    MONITOR_RETRY_SECONDS,
+    RATE_LIMITS,
+    RATE_LIMIT_MAX_CLIENTS,
+    READ_CHUNK_BYTES,
+    REQUEST_STATUSES,
+    SERVER_STATE_PATH,
+    SESSIONS_LOCK_PATH,
+    SESSIONS_PATH,
+    SESSION_COOKIE,
+    SESSION_SLIDE_STEP_SECONDS,
+    SESSION_TTL_SECONDS,
+    SNAPSHOT_CHUNK_SIZE,
+    SSE_HEARTBEAT_SECONDS,
+    STATS_DEFAULT_WINDOW,
+    TRUSTED_PROXY_ADDRESSES,
+    WAIT_POLL_MAX_SECONDS,
+    ApprovalStats,
+    FileWatcher,
+    StoreLock,
+    atomic_write_json,
+    b64decode,
+    b64encode,
+    create_requests,
+    expire_request,
+    file_signature,
+    forget_inherited_storages,
+    full_body,
+    get_storage,
+    hash_access_key,
+    hash_password,
+    list_namespaces,
+    load_json,
+    namespace_exists,
+    normalize_namespace,
+    parse_request_specs,
+    parse_timestamp,
+    parse_window,
+    transition_requests,
+    utc_now,
+)
+
+METRIC_ROUTES = frozenset(
+    {
+        "/",
+        "/login",
+        "/app.css",
+        "/app.js",
+        "/health",
+        "/metrics",
+        "/api/requests",
+        "/api/events",
+        "/api/stats",
+        "/api/namespaces",
+        "/api/requests:batch",
+        "/api/decisions:batch",
+    }
+)
+METRIC_REQUEST_ROUTES = (
+    ("/decision", "/api/requests/{id}/decision"),
+    ("/wait", "/api/requests/{id}/wait"),
+    ("/body", "/api/requests/{id}/body"),
+)
+
+
+def metric_route(path):
+    if "?" in path:
+        path = path[: path.index("?")]
+    if path.startswith("/api/ns/"):
+        path = "/api/" + path[len("/api/ns/"):].partition("/")[2]
+    if path in METRIC_ROUTES:
+        return path
+    if path.startswith("/api/requests/"):
+        for suffix, route in METRIC_REQUEST_ROUTES:
+            if path.endswith(suffix):
+                return route
+        return "/api/requests/{id}"
+    return "other"
+
+
+def store_size(storages):
+    total = 0
+    for path in (path for storage in storages for path in storage.watch_paths):
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def blobs_size():
+    total = 0
+    for root, _, files in os.walk(BLOBS_DIR):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class Metrics:
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        self.enabled = False
+        self.buckets = buckets
+        self.in_flight = 0
+        self._requests = {}
+        self._operations = {}
+        self._blobs_size = (None, 0)
+
+    def _cell(self, table, key):
+        cell = table.get(key)
+        if cell is None:
+            cell = table.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+        return cell
+
+    def _observe(self, cell, elapsed):
+        cell[bisect.bisect_left(self.buckets, elapsed)] += 1
+        cell[-1] += elapsed
+
+    def observe_request(self, path, status, elapsed):
+        route = metric_route(path)
+        statuses = self._requests.get(route)
+        if statuses is None:
+            statuses = self._requests.setdefault(route, {})
+        self._observe(self._cell(statuses, status), elapsed)
+
+    def observe(self, operation, elapsed):
+        self._observe(self._cell(self._operations, operation), elapsed)
+
+    def blobs_size(self):
+        checked, size = self._blobs_size
+        now = time.monotonic()
+        if checked is None or now - checked >= METRICS_BLOB_SIZE_TTL_SECONDS:
+            size = blobs_size()
+            self._blobs_size = (now, size)
+        return size
+
+    def _histogram(self, lines, name, help_text, rows):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, cell in rows:
+            cell = list(cell)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), cell):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {cell[-1]:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+    def _gauge(self, lines, name, help_text, rows):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in rows:
+            lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+    def render(self, server):
+        monitors = server.monitors.items()
+        lines = []
+        self._histogram(
+            lines,
+            "remote_ui_http_request_duration_seconds",
+            "Time spent handling HTTP requests by route and status.",
+            [
+                (f'route="{route}",status="{int(status)}"', cell)
+                for route, statuses in sorted(self._requests.items())
+                for status, cell in sorted(statuses.items())
+            ],
+        )
+        self._histogram(
+            lines,
+            "remote_ui_operation_duration_seconds",
+            "Time spent in PBKDF2 and request store reads and writes.",
+            [(f'operation="{operation}"', cell) for operation, cell in sorted(self._operations.items())],
+        )
+        self._gauge(lines, "remote_ui_handlers_in_flight", "Requests currently being handled.", [("", self.in_flight)])
+        self._gauge(lines, "remote_ui_threads", "Live threads in this server process.", [("", threading.active_count())])
+        self._gauge(lines, "remote_ui_sessions", "Unexpired login sessions.", [("", SESSIONS.count())])
+        self._gauge(
+            lines,
+            "remote_ui_requests",
+            "Approval requests by namespace and status.",
+            [
+                (f'namespace="{namespace}",status="{status}"', view.count(status))
+                for namespace, view in ((namespace, monitor.view()) for namespace, monitor in monitors)
+                for status in REQUEST_STATUSES
+            ],
+        )
+        self._gauge(
+            lines,
+            "remote_ui_store_bytes",
+            "Size of the request stores and body blobs on disk.",
+            [("", store_size([monitor.repository.storage for _, monitor in monitors]) + self.blobs_size())],
+        )
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+METRICS = Metrics()
+
+
+class ChangeNotifier:
+    def __init__(self, buffer_size=EVENT_BUFFER_SIZE):
+        self.version = 0
+        self._events = deque(maxlen=buffer_size)
+        self._condition = threading.Condition()
+        self._async_waiters = set()
+
+    def publish(self, kind, request):
+        with self._condition:
+            self.version += 1
+            self._events.append((self.version, kind, request))
+            self._condition.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass
+
+    def events_since(self, version):
+        with self._condition:
+            if version >= self.version:
+                return []
+            if not self._events or self._events[0][0] > version + 1:
+                return None
+            return [event for event in self._events if event[0] > version]
+
+    def wait(self, version, timeout=None):
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    async def wait_async(self, version, timeout=None):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            if self.version != version:
+                return self.version
+            self._async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                self._async_waiters.discard(waiter)
+        return self.version
+
+    def frames_since(self, version):
+        events = self.events_since(version) if version <= self.version else None
+        if events is None:
+            version = self.version
+            return f"id: {version}\nevent: resync\ndata: {{}}\n\n".encode("utf-8"), version
+        chunks = []
+        for seq, kind, request in events:
+            data = json.dumps(request, separators=(",", ":"))
+            chunks.append(f"id: {seq}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8"))
+            version = seq
+        return b"".join(chunks), version
+
+
+def encode_cursor(key):
+    return b64encode(json.dumps(list(key), separators=(",", ":")).encode("utf-8"))
+
+
+def decode_cursor(cursor):
+    created_at, request_id = json.loads(b64decode(cursor).decode("utf-8"))
+    if not isinstance(created_at, str) or not isinstance(request_id, str):
+        raise ValueError("invalid cursor")
+    return (created_at, request_id)
+
+
+class RequestRecord:
+    FIELDS = (
+        ("id", "id"),
+        ("title", "title"),
+        ("prompt", "prompt"),
+        ("prompt_digest", "promptDigest"),
+        ("prompt_size", "promptSize"),
+        ("status", "status"),
+        ("response", "response"),
+        ("response_digest", "responseDigest"),
+        ("response_size", "responseSize"),
+        ("created_at", "createdAt"),
+        ("decided_at", "decidedAt"),
+        ("expires_at", "expiresAt"),
+        ("seq", "seq"),
+        ("version", "version"),
+    )
+    OPTIONAL_KEYS = frozenset({"expiresAt", "seq", "promptDigest", "promptSize", "responseDigest", "responseSize"})
+    KNOWN_KEYS = frozenset(key for _, key in FIELDS)
+    __slots__ = tuple(attr for attr, _ in FIELDS) + ("expires_epoch", "extra")
+
+    def __init__(self, data):
+        for attr, key in self.FIELDS:
+            setattr(self, attr, data.get(key))
+        self.version = self.version or 1
+        self.expires_epoch = parse_timestamp(self.expires_at)
+        extra = {key: value for key, value in data.items() if key not in self.KNOWN_KEYS}
+        self.extra = extra or None
+
+    @property
+    def sort_key(self):
+        return (self.created_at or "", self.id or "")
+
+    @property
+    def etag(self):
+        return f'"{self.version}"'
+
+    def to_dict(self, fields=None):
+        data = {}
+        for attr, key in self.FIELDS:
+            value = getattr(self, attr)
+            if value is None and key in self.OPTIONAL_KEYS:
+                continue
+            if fields is None or key in fields:
+                data[key] = value
+        if self.extra:
+            for key, value in self.extra.items():
+                if fields is None or key in fields:
+                    data[key] = value
+        return data
+
+
+class SortedChunks:
+    __slots__ = ("chunks", "lasts", "length")
+
+    def __init__(self, chunks=()):
+        self.chunks = chunks
+        self.lasts = tuple(keys[-1] for keys, _ in chunks)
+        self.length = sum(len(keys) for keys, _ in chunks)
+
+    def __len__(self):
+        return self.length
+
+    @classmethod
+    def build(cls, pairs):
+        keys = tuple(key for key, _ in pairs)
+        records = tuple(record for _, record in pairs)
+        return cls(
+            tuple(
+                (keys[start : start + SNAPSHOT_CHUNK_SIZE], records[start : start + SNAPSHOT_CHUNK_SIZE])
+                for start in range(0, len(keys), SNAPSHOT_CHUNK_SIZE)
+            )
+        )
+
+    def insert(self, key, record):
+        chunks = self.chunks
+        if not chunks:
+            return SortedChunks((((key,), (record,)),))
+        index = min(bisect.bisect_left(self.lasts, key), len(chunks) - 1)
+        keys, records = chunks[index]
+        position = bisect.bisect_left(keys, key)
+        keys = keys[:position] + (key,) + keys[position:]
+        records = records[:position] + (record,) + records[position:]
+        if len(keys) > 2 * SNAPSHOT_CHUNK_SIZE:
+            middle = len(keys) // 2
+            replacement = ((keys[:middle], records[:middle]), (keys[middle:], records[middle:]))
+        else:
+            replacement = ((keys, records),)
+        return SortedChunks(chunks[:index] + replacement + chunks[index + 1 :])
+
+    def remove(self, key):
+        chunks = self.chunks
+        index = bisect.bisect_left(self.lasts, key)
+        if index == len(chunks):
+            return self
+        keys, records = chunks[index]
+        position = bisect.bisect_left(keys, key)
+        if keys[position] != key:
+            return self
+        keys = keys[:position] + keys[position + 1 :]
+        records = records[:position] + records[position + 1 :]
+        replacement = ((keys, records),) if keys else ()
+        return SortedChunks(chunks[:index] + replacement + chunks[index + 1 :])
+
+    def items(self, cursor=None, descending=False):
+        chunks = self.chunks
+        if descending:
+            index = bisect.bisect_left(self.lasts, cursor) if cursor else len(chunks)
+            if index == len(chunks):
+                index -= 1
+                position = len(chunks[index][0]) if chunks else 0
+            else:
+                position = bisect.bisect_left(chunks[index][0], cursor)
+            while index >= 0:
+                keys, records = chunks[index]
+                for offset in range(position - 1, -1, -1):
+                    yield keys[offset], records[offset]
+                index -= 1
+                position = len(chunks[index][0]) if index >= 0 else 0
+            return
+        index = bisect.bisect_right(self.lasts, cursor) if cursor else 0
+        position = bisect.bisect_right(chunks[index][0], cursor) if cursor and index < len(chunks) else 0
+        for keys, records in chunks[index:]:
+            for offset in range(position, len(keys)):
+                yield keys[offset], records[offset]
+            position = 0
+
+
+EMPTY_CHUNKS = SortedChunks()
+
+
+def latest_changes(records):
+    latest = {}
+    for record in records:
+        latest.pop(record.id, None)
+        latest[record.id] = record
+    return list(latest.values())
+
+
+class RepositoryView:
+    __slots__ = ("seq", "by_id", "ordered", "by_status", "change_seqs", "change_records", "change_count")
+
+    def __init__(self, seq, by_id, ordered, by_status, change_seqs, change_records):
+        self.seq = seq
+        self.by_id = by_id
+        self.ordered = ordered
+        self.by_status = by_status
+        self.change_seqs = change_seqs
+        self.change_records = change_records
+        self.change_count = len(change_seqs)
+
+    def get(self, request_id):
+        return self.by_id.get(request_id)
+
+    def count(self, status):
+        return len(self.by_status.get(status, EMPTY_CHUNKS))
+
+    def changed_since(self, since, statuses=None):
+        start = bisect.bisect_right(self.change_seqs, since, 0, self.change_count)
+        records = latest_changes(self.change_records[start : self.change_count])
+        if statuses:
+            records = [record for record in records if record.status in statuses]
+        return records
+
+    def page(self, statuses=None, limit=None, cursor=None, descending=False):
+        sources = [self.by_status.get(status, EMPTY_CHUNKS) for status in statuses] if statuses else [self.ordered]
+        iterators = [source.items(cursor, descending) for source in sources]
+        merged = heapq.merge(*iterators, key=operator.itemgetter(0), reverse=descending)
+        items = list(itertools.islice(merged, limit)) if limit else list(merged)
+        next_cursor = encode_cursor(items[-1][0]) if limit and len(items) == limit else None
+        return [record for _, record in items], next_cursor
+
+
+class RequestRepository:
+    def __init__(self, storage):
+        self.storage = storage
+        self.seq = 0
+        self.by_id = {}
+        self.lock = threading.RLock()
+        self._all = EMPTY_CHUNKS
+        self._by_status = {}
+        self._change_seqs = []
+        self._change_records = []
+        self._expiries = []
+        self._signature = None
+        self._cursor = None
+        self.view = RepositoryView(0, self.by_id, EMPTY_CHUNKS, {}, [], [])
+        self.stats = ApprovalStats()
+
+    def is_stale(self):
+        return self.storage.signature() != self._signature
+
+    def refresh(self):
+        signature = self.storage.signature()
+        if signature == self._signature:
+            return []
+        started = time.perf_counter()
+        requests, self._cursor = self.storage.read_since(self._cursor)
+        if METRICS.enabled:
+            METRICS.observe("store_load", time.perf_counter() - started)
+        self._signature = signature
+        with self.lock:
+            changes = self._apply(requests)
+            if changes:
+                self.view = RepositoryView(
+                    self.seq, self.by_id, self._all, dict(self._by_status), self._change_seqs, self._change_records
+                )
+        return changes
+
+    def get(self, request_id):
+        return self.by_id.get(request_id)
+
+    def pop_expired(self, now):
+        expired = []
+        with self.lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                _, request_id = heapq.heappop(self._expiries)
+                record = self.by_id[request_id]
+                if self._expires(record):
+                    expired.append(record)
+        return expired
+
+    def next_expiry(self):
+        with self.lock:
+            while self._expiries:
+                expires, request_id = self._expiries[0]
+                if self._expires(self.by_id[request_id]) == expires:
+                    return expires
+                heapq.heappop(self._expiries)
+        return None
+
+    def requeue(self, records):
+        with self.lock:
+            for record in records:
+                current = self.by_id[record.id]
+                if self._expires(current):
+                    heapq.heappush(self._expiries, (current.expires_epoch, current.id))
+
+    def _expires(self, record):
+        return record.expires_epoch if record.status == "pending" else None
+
+    def _apply(self, requests):
+        changes = []
+        rebuild = len(requests) > len(self.by_id) + SNAPSHOT_CHUNK_SIZE
+        for request in requests:
+            previous = self.by_id.get(request.get("id"))
+            if previous is not None:
+                seq = request.get("seq") or 0
+                if seq < (previous.seq or 0):
+                    continue
+                if seq == (previous.seq or 0) and previous.status == request.get("status"):
+                    continue
+            record = RequestRecord(request)
+            if not rebuild:
+                self._index(previous, record)
+            self._log(record)
+            self.by_id[record.id] = record
+            if self._expires(record) is not None:
+                heapq.heappush(self._expiries, (record.expires_epoch, record.id))
+            self.stats.record(record.id, record.status, record.created_at, record.decided_at, previous and previous.status)
+            changes.append((previous, record))
+        if rebuild and changes:
+            self._rebuild()
+        return changes
+
+    def _index(self, previous, record):
+        if previous is not None:
+            self._all = self._all.remove(previous.sort_key)
+            self._by_status[previous.status] = self._by_status[previous.status].remove(previous.sort_key)
+        self._all = self._all.insert(record.sort_key, record)
+        self._by_status[record.status] = self._by_status.get(record.status, EMPTY_CHUNKS).insert(record.sort_key, record)
+
+    def _rebuild(self):
+        pairs = sorted(((record.sort_key, record) for record in self.by_id.values()), key=operator.itemgetter(0))
+        self._all = SortedChunks.build(pairs)
+        self._by_status = {
+            status: SortedChunks.build([pair for pair in pairs if pair[1].status == status])
+            for status in {record.status for record in self.by_id.values()}
+        }
+
+    def _log(self, record):
+        seq = record.seq or 0
+        if seq >= self.seq:
+            self._change_seqs.append(seq)
+            self._change_records.append(record)
+        else:
+            position = bisect.bisect_right(self._change_seqs, seq)
+            self._change_seqs = self._change_seqs[:position] + [seq] + self._change_seqs[position:]
+            self._change_records = self._change_records[:position] + [record] + self._change_records[position:]
+        self.seq = max(self.seq, seq)
+        if len(self._change_records) > 2 * len(self.by_id) + CHANGE_LOG_SLACK:
+            self._change_records = latest_changes(self._change_records)
+            self._change_seqs = [record.seq or 0 for record in self._change_records]
+
+
+class StoreMonitor:
+    def __init__(self, notifier, storage, namespace=DEFAULT_NAMESPACE):
+        self.notifier = notifier
+        self.namespace = namespace
+        self.repository = RequestRepository(storage)
+        self.lock = threading.RLock()
+        self._unpublished = []
+        self._thread = None
+
+    def start(self):
+        self.scan(publish=False)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        watcher = FileWatcher(self.repository.storage.watch_paths)
+        try:
+            while True:
+                try:
+                    timeout = self.scan()
+                except Exception as exc:
+                    sys.stderr.write(f"Store monitor for namespace {self.namespace} failed: {exc}\n")
+                    time.sleep(MONITOR_RETRY_SECONDS)
+                    continue
+                watcher.wait(timeout)
+        finally:
+            watcher.close()
+
+    def view(self):
+        if self.repository.is_stale():
+            self.scan()
+        return self.repository.view
+
+    def _current(self, request_id):
+        self._unpublished.extend(self.repository.refresh())
+        record = self.repository.get(request_id)
+        return record.to_dict() if record else None
+
+    def transition(self, request_id, updates, expected_version=None):
+        return self.transition_many([(request_id, updates, expected_version)])[0]
+
+    def transition_many(self, changes):
+        with self.lock:
+            started = time.perf_counter()
+            results = transition_requests(changes, current=self._current, namespace=self.namespace)
+            if METRICS.enabled:
+                METRICS.observe("store_save", time.perf_counter() - started)
+            self._unpublished.extend(self.repository.refresh())
+            self._publish()
+        return results
+
+    def create(self, specs):
+        started = time.perf_counter()
+        requests = create_requests(specs, self.namespace)
+        if METRICS.enabled:
+            METRICS.observe("store_save", time.perf_counter() - started)
+        with self.lock:
+            self._unpublished.extend(self.repository.refresh())
+            self._publish()
+        return requests
+
+    def scan(self, publish=True):
+        now = time.time()
+        with self.lock:
+            self._unpublished.extend(self.repository.refresh())
+            expired = self.repository.pop_expired(now)
+            try:
+                for record in expired:
+                    expire_request(record.id, current=self._current, namespace=self.namespace)
+            finally:
+                self._unpublished.extend(self.repository.refresh())
+                self.repository.requeue(expired)
+            if publish:
+                self._publish()
+            else:
+                self._unpublished.clear()
+            expiry = self.repository.next_expiry()
+        if expiry is None:
+            return None
+        return max(0.0, expiry - now)
+
+    def _publish(self):
+        changes, self._unpublished = self._unpublished, []
+        for previous, record in changes:
+            if previous is not None and previous.status == record.status:
+                continue
+            if previous is None:
+                kind = "request-created"
+            elif record.status == "expired":
+                kind = "request-expired"
+            else:
+                kind = "request-decided"
+            self.notifier.publish(kind, record.to_dict())
+
+
+class NamespaceNotFound(Exception):
+    pass
+
+
+class MonitorRegistry:
+    def __init__(self):
+        self._monitors = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace, create=False):
+        monitor = self._monitors.get(namespace)
+        if monitor is not None:
+            return monitor
+        if namespace is None or not create and not namespace_exists(namespace):
+            raise NamespaceNotFound(namespace)
+        with self._lock:
+            monitor = self._monitors.get(namespace)
+            if monitor is None:
+                storage = get_storage(namespace)
+                storage.ensure()
+                monitor = StoreMonitor(ChangeNotifier(), storage, namespace)
+                monitor.start()
+                self._monitors[namespace] = monitor
+        return monitor
+
+    def items(self):
+        with self._lock:
+            return sorted(self._monitors.items())
+
+
+def verify_access_key(config, access_key):
+    if config.access_key_salt is None:
+        return False
+    started = time.perf_counter()
+    digest = hash_access_key(access_key, config.access_key_salt)
+    if METRICS.enabled:
+        METRICS.observe("pbkdf2", time.perf_counter() - started)
+    return hmac.compare_digest(digest, config.get("accessKeyHash") or "")
+
+
+def verify_password(config, password):
+    if config.password_salt is None:
+        return False
+    started = time.perf_counter()
+    digest = hash_password(password, config.password_salt)
+    if METRICS.enabled:
+        METRICS.observe("pbkdf2", time.perf_counter() - started)
+    return hmac.compare_digest(digest, config.get("passwordHash") or "")
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self, workers=HASH_WORKERS, queue_limit=HASH_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def configure(self, workers, queue_limit):
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.workers = max(1, workers)
+            self.queue_limit = max(0, queue_limit)
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise HashPoolSaturated()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="remote-ui-hash")
+            self._pending += 1
+            future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+
+HASH_POOL = HashingPool()
+
+
+class VerifiedKeyCache:
+    def __init__(self, ttl=KEY_CACHE_TTL_SECONDS, max_entries=KEY_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._secret = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, access_key):
+        return hmac.new(self._secret, access_key.encode("utf-8"), hashlib.sha256).digest()
+
+    def is_cached(self, config, access_key):
+        key_hash = (config.get("accessKeyHash") or "").encode("ascii")
+        digest = self._digest(access_key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry:
+                cached_hash, expires_at = entry
+                if expires_at > time.monotonic() and hmac.compare_digest(cached_hash, key_hash):
+                    self._entries.move_to_end(digest)
+                    return True
+                self._entries.pop(digest, None)
+        return False
+
+    def verify(self, config, access_key):
+        if self.is_cached(config, access_key):
+            return True
+        if not HASH_POOL.run(verify_access_key, config, access_key):
+            return False
+        key_hash = (config.get("accessKeyHash") or "").encode("ascii")
+        digest = self._digest(access_key)
+        with self._lock:
+            self._entries[digest] = (key_hash, time.monotonic() + self.ttl)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+VERIFIED_KEYS = VerifiedKeyCache()
+
+
+class RateLimiter:
+    def __init__(self, limits=RATE_LIMITS, max_clients=RATE_LIMIT_MAX_CLIENTS):
+        self.limits = limits
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client, bucket):
+        capacity, rate = self.limits[bucket]
+        key = (client, bucket)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0
+            else:
+                retry_after = max(1, int((1 - tokens) / rate + 0.999))
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+RATE_LIMITER = RateLimiter()
+
+
+class RateLimitClient:
+    def __init__(self, sock):
+        self._sock = sock
+        self._lock = threading.Lock()
+
+    def take(self, client, bucket):
+        with self._lock:
+            self._sock.sendall(f"{bucket}\t{client[:256]}".encode("utf-8"))
+            reply = self._sock.recv(64)
+        return int(reply or b"0")
+
+
+def serve_rate_limits(sock, limiter):
+    with sock:
+        while True:
+            message = sock.recv(512)
+            if not message:
+                return
+            bucket, _, client = message.decode("utf-8", "replace").partition("\t")
+            retry_after = limiter.take(client, bucket) if bucket in limiter.limits else 0
+            sock.sendall(str(retry_after).encode("ascii"))
+
+
+class SessionStore:
+    def __init__(self, path=SESSIONS_PATH, ttl=SESSION_TTL_SECONDS, sliding=False, lock_path=SESSIONS_LOCK_PATH):
+        self.path = path
+        self.ttl = ttl
+        self.sliding = sliding
+        self.generation = ""
+        self._sessions = {}
+        self._expiries = []
+        self._signature = None
+        self._lock = threading.Lock()
+        self._file_lock = StoreLock(lock_path) if path else None
+
+    def _digest(self, token):
+        return hashlib.sha256(f"{self.generation}\0{token}".encode("utf-8")).hexdigest()
+
+    def load(self):
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        self._signature = file_signature(self.path)
+        payload = load_json(self.path, {})
+        sessions = payload.get("sessions") if isinstance(payload, dict) else None
+        now = time.time()
+        self._sessions = {
+            digest: expires_at
+            for digest, expires_at in (sessions or {}).items()
+            if isinstance(expires_at, (int, float)) and expires_at > now
+        }
+        self._expiries = [(expires_at, digest) for digest, expires_at in self._sessions.items()]
+        heapq.heapify(self._expiries)
+
+    def _refresh(self):
+        if self.path and file_signature(self.path) != self._signature:
+            self._load()
+
+    @contextlib.contextmanager
+    def _persist(self):
+        if not self.path:
+            yield
+            return
+        with self._file_lock:
+            self._refresh()
+            yield
+            atomic_write_json(self.path, {"sessions": self._sessions}, mode=0o600)
+            self._signature = file_signature(self.path)
+
+    def _expire(self, now):
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, digest = heapq.heappop(self._expiries)
+            if self._sessions.get(digest) == expires_at:
+                del self._sessions[digest]
+
+    def _set(self, digest, expires_at):
+        self._expire(time.time())
+        self._sessions[digest] = expires_at
+        heapq.heappush(self._expiries, (expires_at, digest))
+
+    def create(self):
+        token = secrets.token_urlsafe(24)
+        expires_at = time.time() + self.ttl
+        with self._lock, self._persist():
+            self._set(self._digest(token), expires_at)
+        return token
+
+    def is_valid(self, token):
+        digest = self._digest(token)
+        now = time.time()
+        with self._lock:
+            self._refresh()
+            expires_at = self._sessions.get(digest)
+            if not expires_at:
+                return False
+            if expires_at <= now:
+                del self._sessions[digest]
+                return False
+            if self.sliding and now + self.ttl - expires_at >= SESSION_SLIDE_STEP_SECONDS:
+                with self._persist():
+                    if digest in self._sessions:
+                        self._set(digest, now + self.ttl)
+        return True
+
+    def peek(self, token):
+        expires_at = self._sessions.get(self._digest(token))
+        return bool(expires_at) and expires_at > time.time()
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            self._expire(time.time())
+            return len(self._sessions)
+
+
+SESSIONS = SessionStore()
+
+
+def apply_credentials(previous, config):
+    if config is None:
+        return
+    SESSIONS.generation = config.get("passwordHash") or ""
+    if previous is not None and previous.get("accessKeyHash") != config.get("accessKeyHash"):
+        VERIFIED_KEYS.clear()
+
+
+def encoded_etag(etag, encoding):
+    return f'{etag[:-1]}{GZIP_ETAG_SUFFIX}"' if encoding == "gzip" else etag
+
+
+def etag_matches(header, etag):
+    if not header:
+        return None
+    variants = {etag, encoded_etag(etag, "gzip")}
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.removeprefix("W/") in variants:
+            return candidate.removeprefix("W/")
+    return None
+
+
+def parse_if_match(header):
+    if not header or header.strip() == "*":
+        return None
+    return int(header.strip().removeprefix("W/").strip('"').removesuffix(GZIP_ETAG_SUFFIX))
+
+
+def not_modified_response(handler, etag, cache_control="private, no-cache"):
+    handler.send_response(HTTPStatus.NOT_MODIFIED)
+    handler.send_header("ETag", etag)
+    handler.send_header("Vary", "Accept-Encoding")
+    handler.send_header("Cache-Control", cache_control)
+    handler.end_headers()
+
+
+def accepts_gzip(header):
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def negotiate_body(handler, data):
+    if len(data) >= GZIP_MIN_BYTES and accepts_gzip(handler.headers.get("Accept-Encoding")):
+        return gzip.compress(data, GZIP_LEVEL), "gzip"
+    return data, None
+
+
+def send_security_headers(handler, html=False):
+    handler.send_header("X-Content-Type-Options", "nosniff")
+    if html:
+        handler.send_header("Content-Security-Policy", "default-src 'self'; style-src 'self' 'unsafe-inline'; script-src 'self'")
+    handler.send_header("X-Frame-Options", "DENY")
+    handler.send_header("Referrer-Policy", "no-referrer")
+    if hasattr(handler, "_is_https") and handler._is_https():
+        handler.send_header("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+
+
+def json_response(handler, payload, status=HTTPStatus.OK, etag=None, headers=None):
+    data, encoding = negotiate_body(handler, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(data)))
+    if encoding:
+        handler.send_header("Content-Encoding", encoding)
+    handler.send_header("Vary", "Accept-Encoding")
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    if etag:
+        handler.send_header("ETag", encoded_etag(etag, encoding))
+        handler.send_header("Cache-Control", "private, no-cache")
+    else:
+        handler.send_header("Cache-Control", "no-store")
+    send_security_headers(handler)
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+class StaticAsset:
+    __slots__ = ("content_type", "data", "gzip_data", "etag", "version")
+
+    def __init__(self, body, content_type):
+        self.content_type = content_type
+        self.data = body.encode("utf-8")
+        self.gzip_data = gzip.compress(self.data, 9, mtime=0)
+        self.version = hashlib.sha256(self.data).hexdigest()[:16]
+        self.etag = f'"{self.version}"'
+
+
+def build_static_assets():
+    css = StaticAsset(APP_CSS, "text/css; charset=utf-8")
+    js = StaticAsset(APP_JS, "application/javascript; charset=utf-8")
+    app_html = APP_HTML.replace('href="/app.css"', f'href="/app.css?v={css.version}"')
+    app_html = app_html.replace('src="/app.js"', f'src="/app.js?v={js.version}"')
+    error_block = '<div class="error">Invalid password. Please try again.</div>'
+    return {
+        "/": StaticAsset(app_html, "text/html; charset=utf-8"),
+        "/app.css": css,
+        "/app.js": js,
+        "/login": StaticAsset(LOGIN_HTML.replace("{error_block}", ""), "text/html; charset=utf-8"),
+        "/login?error": StaticAsset(LOGIN_HTML.replace("{error_block}", error_block), "text/html; charset=utf-8"),
+    }
+
+
+def asset_response(handler, asset, immutable=False):
+    cache_control = IMMUTABLE_CACHE_CONTROL if immutable else "private, no-cache"
+    matched = etag_matches(handler.headers.get("If-None-Match"), asset.etag)
+    if matched:
+        not_modified_response(handler, matched, cache_control)
+        return
+    gzipped = accepts_gzip(handler.headers.get("Accept-Encoding")) and len(asset.gzip_data) < len(asset.data)
+    data = asset.gzip_data if gzipped else asset.data
+    handler.send_response(HTTPStatus.OK)
+    handler.send_header("Content-Type", asset.content_type)
+    handler.send_header("Content-Length", str(len(data)))
+    if gzipped:
+        handler.send_header("Content-Encoding", "gzip")
+    handler.send_header("Vary", "Accept-Encoding")
+    handler.send_header("ETag", encoded_etag(asset.etag, "gzip" if gzipped else None))
+    handler.send_header("Cache-Control", cache_control)
+    send_security_headers(handler, html=asset.content_type.startswith("text/html"))
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+APP_HTML = """<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>CEO Ralph — Approval Console</title>
+  <link rel="stylesheet" href="/app.css">
+</head>
+<body>
+  <header>
+    <h1>CEO Ralph — Approval Console</h1>
+    <div class="subhead">Executive approvals · secure channel</div>
+  </header>
+  <main>
+    <div class="dashboard">
+      <section class="panel">
+        <h2>Queue Status</h2>
+        <label class="namespace" id="namespace-picker" hidden>Namespace
+          <select id="namespace"></select>
+        </label>
+        <div class="status-pill" id="status-pill">Awaiting requests</div>
+        <p id="status-count">0 pending</p>
+        <div class="actions">
+          <button class="approve" id="approve-all" disabled>Approve all</button>
+          <button class="deny" id="deny-all" disabled>Deny all</button>
+        </div>
+        <div class="divider"></div>
+        <p id="last-refresh">Last update: —</p>
+        <p>Approvals here map directly to Claude Code prompts. Your response is written back to the active session.</p>
+      </section>
+      <section>
+        <div class="grid" id="requests"></div>
+      </section>
+    </div>
+  </main>
+  <script src="/app.js"></script>
+</body>
+</html>
+"""
+
+APP_CSS = """:root {
+  color-scheme: light;
+  --ink: #1f1d1b;
+  --muted: #6f675f;
+  --accent: #c59a4a;
+  --accent-strong: #8b5e14;
+  --paper: #f7f1e6;
+  --panel: #fffdf9;
+  --success: #1a7f37;
+  --danger: #b42318;
+  --warn: #b36a00;
+  --shadow: 0 18px 40px rgba(30, 22, 10, 0.12);
+}
+* { box-sizing: border-box; }
+body {
+  margin: 0;
+  font-family: "Iowan Old Style", "Palatino", "Georgia", serif;
+  color: var(--ink);
+  background:
+    radial-gradient(circle at 20% 20%, rgba(197, 154, 74, 0.18), transparent 48%),
+    radial-gradient(circle at 80% 10%, rgba(139, 94, 20, 0.16), transparent 46%),
+    linear-gradient(180deg, #fefbf4 0%, #f1e8d7 100%);
+  min-height: 100vh;
+}
+header {
+  padding: 28px 32px;
+  background: #151515;
+  color: #f8f2e9;
+  border-bottom: 4px solid var(--accent);
+  position: sticky;
+  top: 0;
+  z-index: 10;
+}
+h1 { margin: 0; font-size: 20px; letter-spacing: 0.22em; text-transform: uppercase; }
+.subhead { margin-top: 8px; font-size: 12px; letter-spacing: 0.16em; text-transform: uppercase; color: #e3cc9b; }
+main { padding: 24px 32px 52px; }
+.dashboard {
+  display: grid;
+  gap: 18px;
+  grid-template-columns: minmax(260px, 360px) minmax(280px, 1fr);
+  align-items: start;
+}
+.panel {
+  background: var(--panel);
+  border: 1px solid #e4d7c4;
+  border-radius: 18px;
+  padding: 20px;
+  box-shadow: var(--shadow);
+}
+.panel h2 { margin: 0 0 10px; font-size: 18px; }
+.panel p { margin: 6px 0; color: var(--muted); font-size: 13px; line-height: 1.4; }
+.status-pill {
+  display: inline-flex;
+  align-items: center;
+  gap: 6px;
+  padding: 4px 10px;
+  border-radius: 999px;
+  font-size: 11px;
+  letter-spacing: 0.12em;
+  text-transform: uppercase;
+  font-weight: 700;
+  border: 1px solid currentColor;
+  background: rgba(197, 154, 74, 0.08);
+}
+.grid { display: grid; gap: 18px; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); }
+.card {
+  background: #fff;
+  border: 1px solid #e1d6c7;
+  border-radius: 18px;
+  padding: 18px;
+  box-shadow: 0 14px 28px rgba(27, 21, 10, 0.1);
+  display: flex;
+  flex-direction: column;
+  gap: 12px;
+}
+.status {
+  font-size: 11px;
+  letter-spacing: 0.16em;
+  text-transform: uppercase;
+  font-weight: 700;
+}
+.pending { color: var(--warn); }
+.approved { color: var(--success); }
+.denied { color: var(--danger); }
+.expired { color: var(--muted); }
+h3 { margin: 0; font-size: 18px; }
+.prompt {
+  font-size: 14px;
+  line-height: 1.45;
+  white-space: pre-wrap;
+  background: #fbf7ef;
+  border: 1px dashed #e0d1b5;
+  border-radius: 12px;
+  padding: 12px;
+  margin: 0;
+}
+textarea {
+  width: 100%;
+  min-height: 96px;
+  border: 1px solid #d7cdbf;
+  border-radius: 12px;
+  padding: 12px;
+  font-family: inherit;
+  background: #fdfbf6;
+  resize: vertical;
+}
+.actions { display: flex; gap: 10px; flex-wrap: wrap; }
+button {
+  padding: 10px 16px;
+  border-radius: 999px;
+  border: none;
+  cursor: pointer;
+  font-weight: 700;
+  letter-spacing: 0.06em;
+  text-transform: uppercase;
+  font-size: 11px;
+}
+.approve { background: var(--success); color: #fff; }
+.deny { background: var(--danger); color: #fff; }
+.meta { font-size: 12px; color: var(--muted); }
+.more { background: none; border: none; padding: 0; color: var(--accent-strong); font-size: 12px; cursor: pointer; text-align: left; }
+.divider { height: 1px; background: #e7dcc9; margin: 12px 0; }
+.empty { text-align: center; color: var(--muted); padding: 24px 12px; }
+.namespace { display: flex; flex-direction: column; gap: 6px; margin-bottom: 12px; font-size: 12px; color: var(--muted); text-transform: uppercase; letter-spacing: 0.12em; }
+.namespace[hidden] { display: none; }
+.namespace select { padding: 8px 10px; border: 1px solid #d7cdbf; border-radius: 10px; background: #fdfbf6; font: inherit; text-transform: none; letter-spacing: normal; color: var(--ink); }
+@media (max-width: 920px) {
+  .dashboard { grid-template-columns: 1fr; }
+}
+"""
+
+APP_JS = """function formatTimestamp(ts) {
+  if (!ts) return '';
+  try {
+    return new Date(ts).toLocaleString();
+  } catch (err) {
+    return ts;
+  }
+}
+
+const requestsById = new Map();
+let pollTimer = null;
+let lastSeq = null;
+let eventSource = null;
+let namespace = decodeURIComponent((location.hash.match(/ns=([^&]+)/) || [])[1] || 'default');
+
+function api(path) {
+  return namespace === 'default' ? `/api${path}` : `/api/ns/${encodeURIComponent(namespace)}${path}`;
+}
+
+async function loadNamespaces() {
+  const res = await fetch('/api/namespaces', { cache: 'no-cache' });
+  if (!res.ok) return;
+  const data = await res.json();
+  const select = document.getElementById('namespace');
+  select.innerHTML = '';
+  data.namespaces.forEach(item => {
+    const option = document.createElement('option');
+    option.value = item.name;
+    option.textContent = item.pending ? `${item.name} (${item.pending} pending)` : item.name;
+    option.selected = item.name === namespace;
+    select.appendChild(option);
+  });
+  document.getElementById('namespace-picker').hidden = data.namespaces.length < 2 && namespace === 'default';
+}
+
+function switchNamespace(name) {
+  namespace = name;
+  history.replaceState(null, '', name === 'default' ? location.pathname : `#ns=${encodeURIComponent(name)}`);
+  requestsById.clear();
+  lastSeq = null;
+  fetchRequests();
+  connectEvents();
+}
+
+function mergeRequests(items) {
+  items.forEach(item => {
+    requestsById.set(item.id, item);
+    if (typeof item.seq === 'number' && (lastSeq === null || item.seq > lastSeq)) lastSeq = item.seq;
+  });
+  renderRequests(Array.from(requestsById.values()));
+}
+
+async function fetchRequests() {
+  const current = namespace;
+  const responses = await Promise.all([
+    fetch(api('/requests?status=pending'), { cache: 'no-cache' }),
+    fetch(api('/requests?order=desc&limit=50'), { cache: 'no-cache' })
+  ]);
+  if (current !== namespace) return;
+  if (responses.some(res => !res.ok)) {
+    document.getElementById('status-pill').textContent = 'Offline';
+    return;
+  }
+  const [pending, recent] = await Promise.all(responses.map(res => res.json()));
+  if (current !== namespace) return;
+  requestsById.clear();
+  lastSeq = Math.min(pending.seq, recent.seq);
+  mergeRequests((pending.requests || []).concat(recent.requests || []));
+}
+
+async function pollChanges() {
+  if (lastSeq === null) return fetchRequests();
+  const current = namespace;
+  const res = await fetch(api(`/requests?since=${lastSeq}`), { cache: 'no-cache' });
+  if (current !== namespace) return;
+  if (!res.ok) {
+    document.getElementById('status-pill').textContent = 'Offline';
+    return;
+  }
+  const data = await res.json();
+  if (current !== namespace) return;
+  mergeRequests(data.requests || []);
+  lastSeq = data.seq;
+}
+
+function applyEvent(event) {
+  mergeRequests([JSON.parse(event.data)]);
+}
+
+function startPolling() {
+  if (!pollTimer) pollTimer = setInterval(pollChanges, 2500);
+}
+
+function stopPolling() {
+  if (pollTimer) clearInterval(pollTimer);
+  pollTimer = null;
+}
+
+function connectEvents() {
+  if (eventSource) eventSource.close();
+  if (!window.EventSource) {
+    startPolling();
+    return;
+  }
+  const source = new EventSource(api('/events'));
+  eventSource = source;
+  source.onopen = () => {
+    stopPolling();
+    pollChanges();
+  };
+  source.onerror = () => startPolling();
+  ['request-created', 'request-decided', 'request-expired'].forEach(kind => source.addEventListener(kind, applyEvent));
+  source.addEventListener('resync', fetchRequests);
+}
+
+function renderRequests(items) {
+  const container = document.getElementById('requests');
+  const pendingCount = items.filter(item => item.status === 'pending').length;
+  document.getElementById('status-count').textContent = `${pendingCount} pending`;
+  document.getElementById('status-pill').textContent = pendingCount ? 'Action needed' : 'All clear';
+  document.getElementById('approve-all').disabled = !pendingCount;
+  document.getElementById('deny-all').disabled = !pendingCount;
+  document.getElementById('last-refresh').textContent = `Last update: ${new Date().toLocaleTimeString()}`;
+  if (!items.length) {
+    container.innerHTML = '';
+    const empty = document.createElement('div');
+    empty.className = 'card empty';
+    empty.textContent = 'No requests yet. Claude Code prompts will appear here.';
+    container.appendChild(empty);
+    return;
+  }
+  container.innerHTML = '';
+  items.slice().sort((a, b) => (b.createdAt || '').localeCompare(a.createdAt || '')).forEach(item => {
+    const card = document.createElement('div');
+    card.className = 'card';
+    const statusClass = item.status || 'pending';
+    const status = document.createElement('div');
+    status.className = `status ${statusClass}`;
+    status.textContent = statusClass;
+    const title = document.createElement('h3');
+    title.textContent = item.title || 'Request';
+    const prompt = document.createElement('pre');
+    prompt.className = 'prompt';
+    prompt.textContent = item.prompt || '';
+    const more = document.createElement('button');
+    more.className = 'more';
+    more.textContent = `Show full text (${Math.ceil(((item.promptSize || 0) + (item.responseSize || 0)) / 1024)} KB)`;
+    const meta = document.createElement('div');
+    meta.className = 'meta';
+    meta.textContent = `Requested: ${formatTimestamp(item.createdAt)}`;
+    const textarea = document.createElement('textarea');
+    textarea.placeholder = 'Add context or answer...';
+    textarea.value = item.response || '';
+    const actions = document.createElement('div');
+    actions.className = 'actions';
+    const approveBtn = document.createElement('button');
+    approveBtn.className = 'approve';
+    approveBtn.textContent = 'Approve';
+    const denyBtn = document.createElement('button');
+    denyBtn.className = 'deny';
+    denyBtn.textContent = 'Deny';
+    actions.appendChild(approveBtn);
+    actions.appendChild(denyBtn);
+    card.appendChild(status);
+    card.appendChild(title);
+    card.appendChild(prompt);
+    if (item.promptDigest || item.responseDigest) card.appendChild(more);
+    card.appendChild(meta);
+    card.appendChild(textarea);
+    card.appendChild(actions);
+    more.onclick = () => loadBody(item, prompt, textarea, more);
+    approveBtn.onclick = () => submitDecision(item, 'approved', textarea.value);
+    denyBtn.onclick = () => submitDecision(item, 'denied', textarea.value);
+    if (item.status !== 'pending') {
+      approveBtn.disabled = true;
+      denyBtn.disabled = true;
+      textarea.disabled = true;
+    }
+    container.appendChild(card);
+  });
+}
+
+async function loadBody(item, prompt, textarea, more) {
+  more.disabled = true;
+  const res = await fetch(api(`/requests/${item.id}/body`), { cache: 'no-cache' });
+  if (!res.ok) {
+    more.disabled = false;
+    return;
+  }
+  const body = await res.json();
+  prompt.textContent = body.prompt || '';
+  if (item.status !== 'pending') textarea.value = body.response || '';
+  more.remove();
+}
+
+async function submitDecision(item, decision, response) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (item.version) headers['If-Match'] = `"${item.version}"`;
+  await fetch(api(`/requests/${item.id}/decision`), {
+    method: 'POST',
+    headers,
+    body: JSON.stringify({ decision, response })
+  });
+  pollChanges();
+}
+
+async function decideAll(decision) {
+  const pending = Array.from(requestsById.values()).filter(item => item.status === 'pending');
+  const verb = decision === 'approved' ? 'Approve' : 'Deny';
+  if (!pending.length || !confirm(`${verb} all ${pending.length} pending requests?`)) return;
+  const res = await fetch(api('/decisions:batch'), {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ decisions: pending.map(item => ({ id: item.id, decision, version: item.version })) })
+  });
+  if (!res.ok) alert('Some requests changed in the meantime; nothing was applied. Review the queue and try again.');
+  pollChanges();
+}
+
+document.getElementById('approve-all').onclick = () => decideAll('approved');
+document.getElementById('deny-all').onclick = () => decideAll('denied');
+document.getElementById('namespace').onchange = event => switchNamespace(event.target.value);
+loadNamespaces();
+setInterval(loadNamespaces, 10000);
+fetchRequests();
+connectEvents();
+"""
+
+LOGIN_HTML = """<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>Login — CEO Ralph</title>
+  <style>
+    body {
+      margin: 0;
+      font-family: "Iowan Old Style", "Palatino", "Georgia", serif;
+      background:
+        radial-gradient(circle at 30% 20%, rgba(197, 154, 74, 0.16), transparent 48%),
+        linear-gradient(180deg, #fefbf4 0%, #f1e8d7 100%);
+      color: #2b2b2b;
+      min-height: 100vh;
+      display: flex;
+      align-items: center;
+      justify-content: center;
+      padding: 24px;
+    }
+    main {
+      width: min(420px, 92vw);
+      background: #fff;
+      padding: 32px;
+      border-radius: 18px;
+      border: 1px solid #e1d6c7;
+      box-shadow: 0 16px 30px rgba(27, 21, 10, 0.12);
+    }
+    h1 { margin: 0 0 10px; font-size: 20px; letter-spacing: 0.18em; text-transform: uppercase; }
+    p { margin: 0 0 18px; color: #6f675f; font-size: 13px; }
+    label { display: block; margin-bottom: 8px; font-weight: 600; }
+    input { width: 100%; padding: 12px; border-radius: 12px; border: 1px solid #d7cdbf; font-family: inherit; background: #faf7f1; }
+    button {
+      margin-top: 18px;
+      padding: 12px 14px;
+      border-radius: 999px;
+      border: none;
+      background: #1d1f1f;
+      color: #f6f2ea;
+      font-weight: 700;
+      cursor: pointer;
+      width: 100%;
+      letter-spacing: 0.14em;
+      text-transform: uppercase;
+      font-size: 11px;
+    }
+    .error { background: #fbe9e7; border: 1px solid #f2c1bc; color: #7a271a; padding: 10px 12px; border-radius: 10px; margin: 12px 0; font-size: 13px; }
+  </style>
+</head>
+<body>
+  <main>
+    <h1>Board Portal</h1>
+    <p>Enter your approval passphrase to access the live queue.</p>
+    {error_block}
+    <form method="post" action="/login">
+      <label for="password">Password</label>
+      <input id="password" name="password" type="password" required>
+      <button type="submit">Sign In</button>
+    </form>
+  </main>
+</body>
+</html>
+"""
+
+
+TRANSITION_ERRORS = {
+    "not_found": ("request not found", HTTPStatus.NOT_FOUND),
+    "version_mismatch": ("request has changed", HTTPStatus.PRECONDITION_FAILED),
+    "conflict": ("request already decided", HTTPStatus.CONFLICT),
+}
+
+
+def parse_decision(item):
+    decision = item.get("decision")
+    response_text = item.get("response", "")
+    if decision not in {"approved", "denied"}:
+        raise ValueError("decision must be approved or denied")
+    if not isinstance(response_text, str):
+        raise ValueError("response must be a string")
+    return {"status": decision, "response": response_text, "decidedAt": utc_now()}
+
+
+def parse_decision_batch(items):
+    if not isinstance(items, list) or not items:
+        raise ValueError("decisions must be a non-empty list")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"at most {MAX_BATCH_SIZE} decisions per batch")
+    changes = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+            raise ValueError(f"decision {index}: id must be a string")
+        version = item.get("version")
+        if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+            raise ValueError(f"decision {index}: version must be an integer")
+        try:
+            updates = parse_decision(item)
+        except ValueError as exc:
+            raise ValueError(f"decision {index}: {exc}")
+        changes.append((item["id"], updates, version))
+    if len({request_id for request_id, _, _ in changes}) != len(changes):
+        raise ValueError("each id may appear only once")
+    return changes
+
+
+class RequestBodyError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def parse_cookies(raw):
+    cookies = {}
+    for chunk in raw.split(";"):
+        if "=" in chunk:
+            name, value = chunk.strip().split("=", 1)
+            cookies[name] = value
+    return cookies
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, reuse_port=False):
+        self.reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self):
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+class RemoteUIHandler(BaseHTTPRequestHandler):
+    server_version = "CEO-Ralph-RemoteUI/1.0"
+    started = None
+    response_status = None
+    namespace = DEFAULT_NAMESPACE
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write("%s - - [%s] %s\n" % (self.address_string(), self.log_date_time_string(), fmt % args))
+
+    @property
+    def config(self):
+        return self.server.config.current()
+
+    @property
+    def monitor(self):
+        return self.server.monitors.get(self.namespace)
+
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+
+    def handle_one_request(self):
+        if not METRICS.enabled:
+            self._handle_one_request()
+            return
+        if self.started is None:
+            self.started = time.perf_counter()
+        self.response_status = None
+        METRICS.in_flight += 1
+        try:
+            self._handle_one_request()
+        finally:
+            METRICS.in_flight -= 1
+        if self.response_status is not None:
+            METRICS.observe_request(getattr(self, "path", ""), self.response_status, time.perf_counter() - self.started)
+        self.started = None
+
+    def _handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except HashPoolSaturated:
+            json_response(
+                self,
+                {"error": "server busy"},
+                status=HTTPStatus.SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)},
+            )
+            self.wfile.flush()
+        except RequestBodyError as exc:
+            self.close_connection = True
+            json_response(self, {"error": exc.message}, status=exc.status, headers={"Connection": "close"})
+            self.wfile.flush()
+        except NamespaceNotFound:
+            json_response(self, {"error": "namespace not found"}, status=HTTPStatus.NOT_FOUND)
+            self.wfile.flush()
+
+    def _route(self):
+        path = urllib.parse.urlparse(self.path).path
+        self.namespace = DEFAULT_NAMESPACE
+        if not path.startswith("/api/ns/"):
+            return path
+        name, _, rest = path[len("/api/ns/"):].partition("/")
+        try:
+            self.namespace = normalize_namespace(urllib.parse.unquote(name))
+        except ValueError:
+            self.namespace = None
+        return f"/api/{rest}"
+
+    def _parse_cookies(self):
+        return parse_cookies(self.headers.get("Cookie", ""))
+
+    def _authenticated(self, cookies=True):
+        config = self.config
+        auth_header = self.headers.get("Authorization", "")
+        if auth_header.startswith("Bearer "):
+            token = auth_header.split(" ", 1)[1].strip()
+            local_token = getattr(self.server, "local_token", None)
+            if local_token and hmac.compare_digest(token.encode("utf-8"), local_token.encode("utf-8")):
+                return True
+            return VERIFIED_KEYS.verify(config, token)
+        if not cookies:
+            return False
+        cookies = self._parse_cookies()
+        session_token = cookies.get(SESSION_COOKIE)
+        if session_token and SESSIONS.is_valid(session_token):
+            return True
+        return False
+
+    def _client_ip(self):
+        peer = self.client_address[0]
+        if peer not in TRUSTED_PROXY_ADDRESSES:
+            return peer
+        forwarded = self.headers.get("CF-Connecting-IP") or self.headers.get("X-Forwarded-For", "").split(",")[0]
+        return forwarded.strip() or peer
+
+    def _rate_bucket(self):
+        path = urllib.parse.urlparse(self.path).path
+        if path == "/login":
+            return "login" if self.command == "POST" else None
+        if not path.startswith("/api/"):
+            return None
+        auth_header = self.headers.get("Authorization", "")
+        local_token = getattr(self.server, "local_token", None)
+        if local_token and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ", 1)[1].strip()
+            if hmac.compare_digest(token.encode("utf-8"), local_token.encode("utf-8")):
+                return None
+        return "decision" if self.command == "POST" else "read"
+
+    def _within_rate_limit(self):
+        bucket = self._rate_bucket()
+        if not bucket:
+            return True
+        retry_after = self.server.rate_limiter.take(self._client_ip(), bucket)
+        if not retry_after:
+            return True
+        json_response(
+            self,
+            {"error": "too many requests"},
+            status=HTTPStatus.TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(retry_after)},
+        )
+        return False
+
+    def _require_auth(self, cookies=True):
+        if self._authenticated(cookies):
+            return True
+        self.send_response(HTTPStatus.UNAUTHORIZED)
+        self.send_header("WWW-Authenticate", "Bearer")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return False
+
+    def _is_https(self):
+        forwarded = self.headers.get("X-Forwarded-Proto", "")
+        if forwarded.lower() == "https":
+            return True
+        visitor = self.headers.get("CF-Visitor", "")
+        return "https" in visitor.lower()
+
+    def _set_session_cookie(self, token):
+        parts = [
+            f"{SESSION_COOKIE}={token}",
+            "Path=/",
+            "HttpOnly",
+            "SameSite=Strict",
+        ]
+        if self._is_https():
+            parts.append("Secure")
+        self.send_header("Set-Cookie", "; ".join(parts))
+
+    def _read_body(self, limit=MAX_BODY_BYTES):
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            raise RequestBodyError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length > limit:
+            raise RequestBodyError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"request body exceeds {limit} bytes")
+        chunks = []
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_BYTES, remaining))
+            if not chunk:
+                raise RequestBodyError(HTTPStatus.BAD_REQUEST, "incomplete request body")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _read_json(self):
+        try:
+            payload = json.loads(self._read_body().decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            payload = None
+        if not isinstance(payload, dict):
+            json_response(self, {"error": "invalid json"}, status=HTTPStatus.BAD_REQUEST)
+            return None
+        return payload
+
+    def _redirect(self, target):
+        self.send_response(HTTPStatus.FOUND)
+        self.send_header("Location", target)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _wait_for_decision(self, request_id, timeout):
+        monitor = self.monitor
+        notifier = monitor.notifier
+        deadline = time.monotonic() + timeout
+        while True:
+            version = notifier.version
+            record = monitor.view().get(request_id)
+            if not record or record.status != "pending":
+                return record
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return record
+            notifier.wait(version, remaining)
+
+    def _start_event_stream(self):
+        notifier = self.monitor.notifier
+        try:
+            version = int(self.headers.get("Last-Event-ID", ""))
+        except ValueError:
+            version = notifier.version
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-Accel-Buffering", "no")
+        self.send_header("X-Content-Type-Options", "nosniff")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(b"retry: 3000\n\n")
+        return version
+
+    def _stream_events(self):
+        notifier = self.monitor.notifier
+        try:
+            version = self._start_event_stream()
+            while True:
+                chunk, version = notifier.frames_since(version)
+                if not chunk and notifier.wait(version, SSE_HEARTBEAT_SECONDS) == version:
+                    chunk = b": keepalive\n\n"
+                if chunk:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _list_requests(self):
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        statuses = [status for value in params.get("status", []) for status in value.split(",") if status]
+        fields = [field for value in params.get("fields", []) for field in value.split(",") if field]
+        if fields and "id" not in fields:
+            fields.insert(0, "id")
+        if any(status not in REQUEST_STATUSES for status in statuses):
+            json_response(self, {"error": "invalid status"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        try:
+            since = int(params["since"][0]) if "since" in params else None
+            limit = int(params["limit"][0]) if "limit" in params else None
+            cursor = decode_cursor(params["cursor"][0]) if "cursor" in params else None
+        except (ValueError, TypeError):
+            json_response(self, {"error": "invalid since, limit or cursor"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+            json_response(self, {"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        order = params.get("order", ["asc"])[0]
+        if order not in {"asc", "desc"}:
+            json_response(self, {"error": "order must be asc or desc"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        view = self.monitor.view()
+        etag = f'"{view.seq}"'
+        matched = etag_matches(self.headers.get("If-None-Match"), etag)
+        if matched:
+            not_modified_response(self, matched)
+            return
+        payload = {"seq": view.seq}
+        if since is not None:
+            records = view.changed_since(since, statuses)
+            payload["since"] = since
+        else:
+            records, next_cursor = view.page(statuses, limit, cursor, descending=order == "desc")
+            if next_cursor:
+                payload["nextCursor"] = next_cursor
+        payload["requests"] = [record.to_dict(fields or None) for record in records]
+        json_response(self, payload, etag=etag)
+
+    def do_GET(self):
+        if not self._within_rate_limit():
+            return
+        path = self._route()
+        if path == "/login":
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            asset_response(self, self.server.assets["/login?error" if params.get("error", [""])[0] else "/login"])
+            return
+        if path == "/":
+            if not self._authenticated():
+                self._redirect("/login")
+                return
+            asset_response(self, self.server.assets["/"])
+            return
+        if path in {"/app.css", "/app.js"}:
+            if not self._require_auth():
+                return
+            asset = self.server.assets[path]
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            asset_response(self, asset, immutable=params.get("v", [""])[0] == asset.version)
+            return
+        if path == "/health":
+            json_response(self, {"ok": True})
+            return
+        if path == "/api/requests":
+            if not self._require_auth():
+                return
+            self._list_requests()
+            return
+        if path == "/api/events":
+            if not self._require_auth():
+                return
+            self._stream_events()
+            return
+        if path == "/api/namespaces":
+            if not self._require_auth():
+                return
+            namespaces = []
+            for name in list_namespaces():
+                view = self.server.monitors.get(name).view()
+                namespaces.append({"name": name, "pending": view.count("pending"), "seq": view.seq})
+            json_response(self, {"namespaces": namespaces})
+            return
+        if path == "/api/stats":
+            if not self._require_auth():
+                return
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            try:
+                window = parse_window(params.get("window", [STATS_DEFAULT_WINDOW])[0])
+            except ValueError as exc:
+                json_response(self, {"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+                return
+            self.monitor.view()
+            json_response(self, self.monitor.repository.stats.summary(window))
+            return
+        if path.startswith("/api/requests/") and len(path.split("/")) == 4:
+            if not self._require_auth():
+                return
+            record = self.monitor.view().get(urllib.parse.unquote(path.split("/")[3]))
+            if not record:
+                json_response(self, {"error": "request not found"}, status=HTTPStatus.NOT_FOUND)
+                return
+            matched = etag_matches(self.headers.get("If-None-Match"), record.etag)
+            if matched:
+                not_modified_response(self, matched)
+                return
+            json_response(self, {"request": record.to_dict()}, etag=record.etag)
+            return
+        if path.startswith("/api/requests/") and path.endswith("/body") and len(path.split("/")) == 5:
+            if not self._require_auth():
+                return
+            record = self.monitor.view().get(urllib.parse.unquote(path.split("/")[3]))
+            if not record:
+                json_response(self, {"error": "request not found"}, status=HTTPStatus.NOT_FOUND)
+                return
+            matched = etag_matches(self.headers.get("If-None-Match"), record.etag)
+            if matched:
+                not_modified_response(self, matched)
+                return
+            request = record.to_dict()
+            payload = {"id": record.id, "prompt": full_body(request, "prompt"), "response": full_body(request, "response")}
+            json_response(self, payload, etag=record.etag)
+            return
+        if path.startswith("/api/requests/") and path.endswith("/wait"):
+            if not self._require_auth():
+                return
+            parts = path.split("/")
+            if len(parts) != 5 or not parts[3]:
+                json_response(self, {"error": "invalid request id"}, status=HTTPStatus.BAD_REQUEST)
+                return
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            try:
+                timeout = float(params.get("timeout", [str(WAIT_POLL_MAX_SECONDS)])[0])
+            except ValueError:
+                json_response(self, {"error": "invalid timeout"}, status=HTTPStatus.BAD_REQUEST)
+                return
+            timeout = max(0.0, min(timeout, WAIT_POLL_MAX_SECONDS))
+            record = self._wait_for_decision(urllib.parse.unquote(parts[3]), timeout)
+            if not record:
+                json_response(self, {"error": "request not found"}, status=HTTPStatus.NOT_FOUND)
+                return
+            json_response(self, {"request": record.to_dict()})
+            return
+        if path == "/metrics" and METRICS.enabled:
+            if not self._require_auth(cookies=False):
+                return
+            data, encoding = negotiate_body(self, METRICS.render(self.server))
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Cache-Control", "no-store")
+            send_security_headers(self)
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        self.send_response(HTTPStatus.NOT_FOUND)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        if not self._within_rate_limit():
+            return
+        path = self._route()
+        if path == "/login":
+            body = self._read_body().decode("utf-8")
+            fields = urllib.parse.parse_qs(body)
+            password = fields.get("password", [""])[0]
+            if HASH_POOL.run(verify_password, self.config, password):
+                token = SESSIONS.create()
+                self.send_response(HTTPStatus.FOUND)
+                self._set_session_cookie(token)
+                self.send_header("Location", "/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            else:
+                self.send_response(HTTPStatus.FOUND)
+                self.send_header("Location", "/login?error=1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            return
+        if path.startswith("/api/requests/") and path.endswith("/decision"):
+            if not self._require_auth():
+                return
+            parts = path.split("/")
+            request_id = urllib.parse.unquote(parts[3]) if len(parts) > 3 else None
+            if not request_id:
+                json_response(self, {"error": "invalid request id"}, status=HTTPStatus.BAD_REQUEST)
+                return
+            payload = self._read_json()
+            if payload is None:
+                return
+            try:
+                updates = parse_decision(payload)
+            except ValueError as exc:
+                json_response(self, {"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+                return
+            try:
+                expected_version = parse_if_match(self.headers.get("If-Match"))
+            except ValueError:
+                json_response(self, {"error": "invalid If-Match"}, status=HTTPStatus.BAD_REQUEST)
+                return
+            outcome, request = self.monitor.transition(request_id, updates, expected_version)
+            if outcome == "ok":
+                json_response(self, {"ok": True, "request": request}, etag=f'"{request["version"]}"')
+            else:
+                error, status = TRANSITION_ERRORS[outcome]
+                if request:
+                    json_response(self, {"error": error, "request": request}, status=status, etag=f'"{request["version"]}"')
+                else:
+                    json_response(self, {"error": error}, status=status)
+            return
+        if path == "/api/decisions:batch":
+            if not self._require_auth():
+                return
+            payload = self._read_json()
+            if payload is None:
+                return
+            try:
+                changes = parse_decision_batch(payload.get("decisions"))
+            except ValueError as exc:
+                json_response(self, {"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+                return
+            results = self.monitor.transition_many(changes)
+            failed = [(change[0], outcome, request) for change, (outcome, request) in zip(changes, results) if outcome != "ok"]
+            if not failed:
+                json_response(self, {"ok": True, "requests": [request for _, request in results]})
+                return
+            _, status = TRANSITION_ERRORS[failed[0][1]]
+            errors = [{"id": request_id, "error": TRANSITION_ERRORS[outcome][0], "request": request} for request_id, outcome, request in failed]
+            json_response(self, {"error": "no decisions were applied", "failed": errors}, status=status)
+            return
+        if path == "/api/requests:batch":
+            if not self._require_auth():
+                return
+            payload = self._read_json()
+            if payload is None:
+                return
+            try:
+                specs = parse_request_specs(payload.get("requests"))
+            except ValueError as exc:
+                json_response(self, {"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+                return
+            monitor = self.server.monitors.get(self.namespace, create=True)
+            json_response(self, {"requests": monitor.create(specs)}, status=HTTPStatus.CREATED)
+            return
+        self.send_response(HTTPStatus.NOT_FOUND)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class DeferredWait(Exception):
+    pass
+
+
+class BufferedRemoteUIHandler(RemoteUIHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, raw_request, client_address, server, defer_waits=True, started=None):
+        self.defer_waits = defer_waits
+        self.started = started
+        self.deferred_wait = None
+        self.stream_version = None
+        super().__init__(raw_request, client_address, server)
+
+    def setup(self):
+        self.rfile = io.BytesIO(self.request)
+        self.wfile = io.BytesIO()
+
+    def handle(self):
+        try:
+            self.handle_one_request()
+        except DeferredWait as wait:
+            self.deferred_wait = wait.args
+            self.wfile = io.BytesIO()
+
+    def finish(self):
+        pass
+
+    def handle_expect_100(self):
+        return True
+
+    def _within_rate_limit(self):
+        return not self.defer_waits or super()._within_rate_limit()
+
+    def _wait_for_decision(self, request_id, timeout):
+        record = self.monitor.view().get(request_id)
+        if self.defer_waits and timeout > 0 and record and record.status == "pending":
+            raise DeferredWait(request_id, timeout)
+        return record
+
+    def _stream_events(self):
+        self.stream_version = self._start_event_stream()
+
+
+class AsyncHTTPServer:
+    def __init__(self, server_address, handler_class, reuse_port=False):
+        self.socket = socket.create_server(server_address, backlog=128, reuse_port=reuse_port)
+        self.server_address = self.socket.getsockname()[:2]
+        self.handler_class = handler_class
+        self._loop = None
+        self._stopping = None
+
+    def serve_forever(self):
+        asyncio.run(self._serve())
+
+    def shutdown(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    def server_close(self):
+        self.socket.close()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._loop.set_default_executor(ThreadPoolExecutor(thread_name_prefix="remote-ui"))
+        self._priority_executor = ThreadPoolExecutor(thread_name_prefix="remote-ui-priority")
+        server = await asyncio.start_server(self._serve_connection, sock=self.socket)
+        async with server:
+            await self._stopping.wait()
+
+    async def _serve_connection(self, reader, writer):
+        client_address = writer.get_extra_info("peername")[:2]
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                    break
+                length, expect_continue, chunked = 0, False, False
+                credentials = {}
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    name = name.strip().lower()
+                    if name in {b"authorization", b"cookie"}:
+                        credentials[name.decode("ascii")] = value.strip().decode("latin-1")
+                    value = value.strip().lower()
+                    if name == b"content-length":
+                        length = int(value) if value.isdigit() else -1
+                    elif name == b"transfer-encoding":
+                        chunked = True
+                    elif name == b"expect":
+                        expect_continue = value == b"100-continue"
+                if chunked or length < 0 or length > MAX_BODY_BYTES:
+                    if chunked:
+                        status = HTTPStatus.LENGTH_REQUIRED
+                    elif length < 0:
+                        status = HTTPStatus.BAD_REQUEST
+                    else:
+                        status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                    writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode("ascii"))
+                    break
+                if expect_continue and length:
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                raw_request = head + (await reader.readexactly(length) if length else b"")
+                executor = self._priority_executor if self._is_priority(head, credentials) else None
+                handler = await self._dispatch(raw_request, client_address, executor)
+                writer.write(handler.wfile.getvalue())
+                await writer.drain()
+                if handler.stream_version is not None:
+                    await self._stream_events(writer, self.monitors.get(handler.namespace).notifier, handler.stream_version)
+                    break
+                if handler.close_connection:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _is_priority(self, head, credentials):
+        target = head.split(b"\r\n", 1)[0].split(b" ")
+        if len(target) > 1 and urllib.parse.urlparse(target[1].decode("latin-1")).path == "/health":
+            return True
+        authorization = credentials.get("authorization", "")
+        if authorization.startswith("Bearer "):
+            token = authorization.split(" ", 1)[1].strip()
+            if hmac.compare_digest(token.encode("utf-8"), self.local_token.encode("utf-8")):
+                return True
+            config = self.config.cached()
+            return config is not None and VERIFIED_KEYS.is_cached(config, token)
+        session_token = parse_cookies(credentials.get("cookie", "")).get(SESSION_COOKIE)
+        return bool(session_token) and SESSIONS.peek(session_token)
+
+    async def _dispatch(self, raw_request, client_address, executor=None):
+        loop = asyncio.get_running_loop()
+        handler = await loop.run_in_executor(executor, self.handler_class, raw_request, client_address, self)
+        if handler.deferred_wait:
+            await self._wait_for_decision(self.monitors.get(handler.namespace), *handler.deferred_wait)
+            handler = await loop.run_in_executor(
+                executor, self.handler_class, raw_request, client_address, self, False, handler.started
+            )
+        return handler
+
+    async def _wait_for_decision(self, monitor, request_id, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            version = monitor.notifier.version
+            record = monitor.repository.get(request_id)
+            remaining = deadline - time.monotonic()
+            if not record or record.status != "pending" or remaining <= 0:
+                return
+            await monitor.notifier.wait_async(version, remaining)
+
+    async def _stream_events(self, writer, notifier, version):
+        while True:
+            chunk, version = notifier.frames_since(version)
+            if not chunk and await notifier.wait_async(version, SSE_HEARTBEAT_SECONDS) == version:
+                chunk = b": keepalive\n\n"
+            if chunk:
+                writer.write(chunk)
+                await writer.drain()
+
+
+SERVER_ENGINES = {
+    "threaded": (ThreadingHTTPServer, RemoteUIHandler),
+    "asyncio": (AsyncHTTPServer, BufferedRemoteUIHandler),
+}
+
+
+def create_server(bind_addr, port, engine="threaded", local_token=None, reuse_port=False):
+    server_class, handler_class = SERVER_ENGINES[engine]
+    server = server_class((bind_addr, port), handler_class, reuse_port)
+    server.config = CONFIG
+    CONFIG.subscribe(apply_credentials)
+    apply_credentials(None, CONFIG.current())
+    server.assets = build_static_assets()
+    SESSIONS.load()
+    server.monitors = MonitorRegistry()
+    server.monitors.get(DEFAULT_NAMESPACE)
+    server.rate_limiter = RATE_LIMITER
+    server.local_token = local_token or secrets.token_urlsafe(32)
+    return server
+
+
+def write_server_state(local_token, bind_addr, port):
+    host = "127.0.0.1" if bind_addr in {"", "0.0.0.0", "localhost"} else bind_addr
+    state = {
+        "pid": os.getpid(),
+        "host": host,
+        "port": port,
+        "localToken": local_token,
+        "startedAt": utc_now(),
+    }
+    atomic_write_json(SERVER_STATE_PATH, state, mode=0o600)
+
+
+def clear_server_state(local_token):
+    state = load_json(SERVER_STATE_PATH, None)
+    if isinstance(state, dict) and state.get("localToken") == local_token:
+        try:
+            os.remove(SERVER_STATE_PATH)
+        except FileNotFoundError:
+            pass
+
+
+def start_server_thread(bind_addr, port, engine="threaded"):
+    server = create_server(bind_addr, port, engine)
+    write_server_state(server.local_token, bind_addr, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def exit_with_parent(fd):
+    while os.read(fd, 1):
+        pass
+    os._exit(0)
+
+
+def run_worker(bind_addr, port, engine, local_token, limiter_sock, parent_fd):
+    forget_inherited_storages()
+    server = create_server(bind_addr, port, engine, local_token=local_token, reuse_port=True)
+    server.rate_limiter = RateLimitClient(limiter_sock)
+    threading.Thread(target=exit_with_parent, args=(parent_fd,), daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_workers(bind_addr, port, engine, count):
+    if not hasattr(os, "fork") or not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("--workers needs a platform with fork() and SO_REUSEPORT.")
+    with socket.socket(socket.AF_INET6 if ":" in bind_addr else socket.AF_INET) as probe:
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            probe.bind((bind_addr, port))
+        except OSError as exc:
+            raise RuntimeError(f"Cannot bind {bind_addr}:{port}: {exc.strerror}")
+    local_token = secrets.token_urlsafe(32)
+    workers = {}
+
+    def spawn(index):
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                parent_sock.close()
+                os.close(write_fd)
+                for _, other_fd, other_sock, _ in workers.values():
+                    os.close(other_fd)
+                    other_sock.close()
+                run_worker(bind_addr, port, engine, local_token, child_sock, read_fd)
+            except BaseException as exc:
+                sys.stderr.write(f"Worker {index} failed: {exc}\n")
+                code = 1
+            finally:
+                os._exit(code)
+        child_sock.close()
+        os.close(read_fd)
+        threading.Thread(target=serve_rate_limits, args=(parent_sock, RATE_LIMITER), daemon=True).start()
+        workers[pid] = (index, write_fd, parent_sock, time.monotonic())
+
+    previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    write_server_state(local_token, bind_addr, port)
+    try:
+        for index in range(count):
+            spawn(index)
+        while True:
+            pid, status = os.wait()
+            if pid not in workers:
+                continue
+            index, write_fd, _, started = workers.pop(pid)
+            os.close(write_fd)
+            print(f"Worker {index} (pid {pid}) exited with status {status}; restarting.")
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+            spawn(index)
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid, (_, write_fd, _, _) in workers.items():
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            os.close(write_fd)
+        clear_server_state(local_token)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+import http.client
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+TEST_DIR = tempfile.mkdtemp(prefix="remote-ui-test-")
+os.environ["CEO_RALPH_REMOTE_UI_DIR"] = TEST_DIR
+os.environ.pop("CEO_RALPH_REMOTE_UI_STORAGE", None)
+os.environ.pop("CEO_RALPH_REMOTE_UI_NAMESPACE", None)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import remote_ui_core  # noqa: E402
+import remote_ui_server  # noqa: E402
+
+
+def tearDownModule():
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def new_request(request_id):
+    return {"id": request_id, "title": request_id, "prompt": "p", "status": "pending", "createdAt": remote_ui_core.utc_now()}
+
+
+class JsonRequestStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="remote-ui-test-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.storage = remote_ui_core.JsonRequestStorage(self.directory)
+        self.storage.ensure()
+
+    def test_load_survives_compaction_between_snapshot_and_journal(self):
+        self.storage.commit([{"id": "journal-only", "status": "pending", "createdAt": remote_ui_core.utc_now()}])
+        read_journal = remote_ui_core.read_journal
+        compacted = []
+
+        def compact_first(path):
+            if not compacted:
+                compacted.append(path)
+                self.storage.compact()
+            return read_journal(path)
+
+        with mock.patch.object(remote_ui_core, "read_journal", compact_first):
+            request = self.storage.find("journal-only")
+        self.assertTrue(compacted)
+        self.assertFalse(os.path.exists(self.storage.journal_path))
+        self.assertIsNotNone(request)
+        self.assertEqual(request["status"], "pending")
+
+
+class StoreMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=TEST_DIR)
+        self.storage = remote_ui_core.JsonRequestStorage(self.directory)
+        self.storage.ensure()
+
+    def test_monitor_keeps_publishing_after_a_failed_scan(self):
+        monitor = remote_ui_server.StoreMonitor(remote_ui_server.ChangeNotifier(), self.storage)
+        scan = monitor.scan
+        failures = []
+
+        def fail_once(publish=True):
+            if publish and not failures:
+                failures.append(publish)
+                raise OSError(28, "No space left on device")
+            return scan(publish)
+
+        monitor.scan = fail_once
+        stderr = io.StringIO()
+        with mock.patch.object(remote_ui_server, "MONITOR_RETRY_SECONDS", 0.05), mock.patch.object(sys, "stderr", stderr):
+            monitor.start()
+            self.storage.commit([new_request("after-failure")])
+            version = monitor.notifier.wait(0, timeout=5)
+        self.assertTrue(failures)
+        self.assertIn("No space left on device", stderr.getvalue())
+        self.assertGreaterEqual(version, 1)
+        _, kind, request = monitor.notifier.events_since(0)[0]
+        self.assertEqual((kind, request["id"]), ("request-created", "after-failure"))
+
+
+class DecisionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = remote_ui_server.create_server("127.0.0.1", 0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def decide(self, request_id, decision="approved", if_match=None):
+        headers = {"Authorization": f"Bearer {self.server.local_token}", "Content-Type": "application/json"}
+        if if_match:
+            headers["If-Match"] = if_match
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+        try:
+            body = json.dumps({"decision": decision})
+            connection.request("POST", f"/api/requests/{request_id}/decision", body, headers)
+            response = connection.getresponse()
+            return response.status, response.getheader("ETag"), json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_stale_if_match_returns_412_with_current_etag(self):
+        request = remote_ui_core.create_request("stale", "p")
+        self.assertEqual(self.decide(request["id"], if_match='"1"')[0], 200)
+        status, etag, payload = self.decide(request["id"], "denied", if_match='"1"')
+        self.assertEqual(status, 412)
+        self.assertEqual(etag, '"2"')
+        self.assertEqual(payload["request"]["status"], "approved")
+
+    def test_deciding_a_decided_request_returns_409(self):
+        request = remote_ui_core.create_request("decided", "p")
+        self.assertEqual(self.decide(request["id"])[0], 200)
+        status, etag, payload = self.decide(request["id"], "denied")
+        self.assertEqual(status, 409)
+        self.assertEqual(etag, '"2"')
+        self.assertEqual(payload["request"]["status"], "approved")
+
+    def test_concurrent_transitions_have_exactly_one_winner(self):
+        for backend in (remote_ui_core.JsonRequestStorage, remote_ui_core.SQLiteRequestStorage):
+            with self.subTest(backend=backend.name):
+                storage = backend(tempfile.mkdtemp(dir=TEST_DIR))
+                storage.ensure()
+                storage.commit([new_request("contended")])
+                barrier = threading.Barrier(8)
+                outcomes = []
+
+                def decide(decision):
+                    barrier.wait()
+                    updates = {"status": decision, "response": "", "decidedAt": remote_ui_core.utc_now()}
+                    outcomes.append(storage.transition_many([("contended", updates, None)])[0][0])
+
+                threads = [threading.Thread(target=decide, args=(("approved", "denied")[index % 2],)) for index in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                storage.close()
+                self.assertEqual(sorted(outcomes), ["conflict"] * 7 + ["ok"])
+                self.assertEqual(storage.find("contended")["version"], 2)
+
+
+class SQLiteMigrationTest(unittest.TestCase):
+    namespace = "migration"
+
+    def setUp(self):
+        self.directory = remote_ui_core.namespace_dir(self.namespace)
+        source = remote_ui_core.JsonRequestStorage(self.directory)
+        source.save({"requests": [dict(new_request("snapshot"), seq=1), dict(new_request("decided"), seq=2)], "seq": 2})
+        source.commit([new_request("journal")])
+        source.commit([dict(new_request("decided"), status="approved", version=2)])
+        self.source = source
+        self.expected = {request["id"]: request for request in source.load()["requests"]}
+
+    def tearDown(self):
+        storage = remote_ui_core._STORAGES.pop(self.directory, None)
+        if storage is not None:
+            storage.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_get_storage_migrates_json_store_once(self):
+        with mock.patch.object(remote_ui_core, "STORAGE_BACKEND", "sqlite"):
+            storage = remote_ui_core.get_storage(self.namespace)
+        self.assertEqual(storage.name, "sqlite")
+        migrated = {request["id"]: request for request in storage.load()["requests"]}
+        self.assertEqual(migrated, self.expected)
+        self.assertEqual({request_id: request["seq"] for request_id, request in migrated.items()}, {"snapshot": 1, "decided": 4, "journal": 3})
+        self.assertEqual(migrated["decided"]["status"], "approved")
+        self.assertEqual(storage.signature(), 4)
+
+        self.source.commit([new_request("after-migration")])
+        reopened = remote_ui_core.SQLiteRequestStorage(self.directory)
+        try:
+            self.assertIsNone(reopened.find("after-migration"))
+            self.assertEqual(len(reopened.load()["requests"]), 3)
+            self.assertEqual(reopened.signature(), 4)
+        finally:
+            reopened.close()
+
+
+class ApprovalStatsTest(unittest.TestCase):
+    def decide(self, stats, request_id, created, latency):
+        stats.record(request_id, "approved", created, self.timestamp(created, latency), "pending")
+
+    def timestamp(self, base, offset):
+        moment = remote_ui_core.parse_timestamp(base) + offset
+        return remote_ui_core.dt.datetime.fromtimestamp(moment, remote_ui_core.dt.timezone.utc).isoformat()
+
+    def test_sub_second_latencies_are_not_rounded_up_to_one_second(self):
+        stats = remote_ui_core.ApprovalStats()
+        created = "2026-01-01T00:00:00Z"
+        self.decide(stats, "zero", created, 0)
+        self.decide(stats, "one", created, 1)
+        summary = stats.summary(now=remote_ui_core.parse_timestamp(created) + 60)["timeToDecision"]
+        self.assertEqual(summary["meanSeconds"], 0.5)
+        self.assertEqual(summary["p50Seconds"], 0.0)
+        self.assertEqual(summary["p90Seconds"], 1.0)
+        self.assertEqual(summary["p99Seconds"], 1.0)
+
+    def test_percentiles_stay_within_observed_range(self):
+        stats = remote_ui_core.ApprovalStats()
+        created = "2026-01-01T00:00:00Z"
+        for index, latency in enumerate((0.2, 0.25, 0.3, 0.4)):
+            self.decide(stats, f"r{index}", created, latency)
+        summary = stats.summary(now=remote_ui_core.parse_timestamp(created) + 60)["timeToDecision"]
+        for key in ("p50Seconds", "p90Seconds", "p99Seconds"):
+            self.assertGreaterEqual(summary[key], 0.2)
+            self.assertLessEqual(summary[key], 0.4)
+        self.assertEqual(summary["p50Seconds"], 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()